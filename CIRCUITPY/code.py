@@ -11,11 +11,31 @@ PICOW_WIFI_PASSWORD = os.getenv("PICOW_WIFI_PASSWORD")
 PICOW_API_KEY = os.getenv("PICOW_API_KEY")
 PICOW_API_PORT = os.getenv("PICOW_API_PORT")
 PICOW_API_POLL_RATE = float(os.getenv("PICOW_API_POLL_RATE"))
+PICOW_API_MODE = os.getenv("PICOW_API_MODE", "POLL")
+PICOW_PINS = os.getenv("PICOW_PINS")
+PICOW_ADC_RATE = float(os.getenv("PICOW_ADC_RATE", "10"))
+PICOW_ADC_SIZE = int(os.getenv("PICOW_ADC_SIZE", 64))
+PICOW_CAPTURE_SIZE = int(os.getenv("PICOW_CAPTURE_SIZE", 2048))
+PICOW_SCOPE_SIZE = int(os.getenv("PICOW_SCOPE_SIZE", 1024))
+PICOW_LOGIC_SIZE = int(os.getenv("PICOW_LOGIC_SIZE", 1024))
+PICOW_EVENT_SIZE = int(os.getenv("PICOW_EVENT_SIZE", 64))
+PICOW_LOG_BUFFER = int(os.getenv("PICOW_LOG_BUFFER", 0))
+PICOW_LOG_FLUSH_INTERVAL = float(os.getenv("PICOW_LOG_FLUSH_INTERVAL", "5"))
+PICOW_LOG_MAX_SIZE = int(os.getenv("PICOW_LOG_MAX_SIZE", 32768))
+PICOW_LOG_SEGMENTS = int(os.getenv("PICOW_LOG_SEGMENTS", 3))
+PICOW_LOG_RAM_SIZE = int(os.getenv("PICOW_LOG_RAM_SIZE", 32))
+PICOW_LOG_FORMAT = os.getenv("PICOW_LOG_FORMAT", "JSON")
+PICOW_LOG_INDEX = int(os.getenv("PICOW_LOG_INDEX", 1))
+PICOW_LOG_RATE_WINDOW = float(os.getenv("PICOW_LOG_RATE_WINDOW", "10"))
+PICOW_LOG_RATE_BURST = int(os.getenv("PICOW_LOG_RATE_BURST", 5))
+PICOW_LOG_CONSOLE_LEVEL = os.getenv("PICOW_LOG_CONSOLE_LEVEL", "DEBUG")
+PICOW_LOG_FILE_LEVEL = os.getenv("PICOW_LOG_FILE_LEVEL", "DEBUG")
+PICOW_LOG_RAM_LEVEL = os.getenv("PICOW_LOG_RAM_LEVEL", "DEBUG")
 
 ### Board Logics ###
 
 # INIT Logger
-logger = red_utility.Logger(filename="syslog.txt", print_log=True)
+logger = red_utility.Logger(filename="syslog.bin" if PICOW_LOG_FORMAT == "BINARY" else "syslog.txt", print_log=True, buffer_size=PICOW_LOG_BUFFER, flush_interval=PICOW_LOG_FLUSH_INTERVAL, max_size=PICOW_LOG_MAX_SIZE, segments=PICOW_LOG_SEGMENTS, ram_size=PICOW_LOG_RAM_SIZE, binary=PICOW_LOG_FORMAT == "BINARY", indexed=PICOW_LOG_INDEX, rate_window=PICOW_LOG_RATE_WINDOW, rate_burst=PICOW_LOG_RATE_BURST, console_level=PICOW_LOG_CONSOLE_LEVEL, file_level=PICOW_LOG_FILE_LEVEL, ram_level=PICOW_LOG_RAM_LEVEL)
 logger.add(f"System Started, Storage Readonly = {logger.get_readonly()}.")
 
 # INIT WLAN
@@ -33,19 +53,31 @@ wlan.sync_time(-4) # Sync localtime to EDT(GMT-4)/EST(GMT-5)
 logger.add(f"IP: {wlan.get_ip()}")
 
 # INIT API SERVER
-api_server = red_api_server.ApiServer(pool=wlan.get_pool(), ip=wlan.get_ip(), port=PICOW_API_PORT, api_key=PICOW_API_KEY, logger=logger, verbose_log=True, debug=False)
-api_server.start(poll_rate=PICOW_API_POLL_RATE)
+api_server = red_api_server.ApiServer(pool=wlan.get_pool(), ip=wlan.get_ip(), port=PICOW_API_PORT, api_key=PICOW_API_KEY, logger=logger, verbose_log=True, pins=PICOW_PINS, adc_rate=PICOW_ADC_RATE, adc_size=PICOW_ADC_SIZE, capture_size=PICOW_CAPTURE_SIZE, scope_size=PICOW_SCOPE_SIZE, logic_size=PICOW_LOGIC_SIZE, event_size=PICOW_EVENT_SIZE, debug=False)
+api_server.start(poll_rate=PICOW_API_POLL_RATE, adaptive=PICOW_API_MODE == "ADAPTIVE")
 logger.add(f"API Server: http://{wlan.get_ip()}:{PICOW_API_PORT}/")
 gc.collect()
 logger.add("Server MemFree: {} bytes".format(gc.mem_free()))
 
-while True:
-    
+# ASYNC runs the adaptive schedule as asyncio tasks, it does not wake on socket readiness and is no lower-latency
+if PICOW_API_MODE == "ASYNC":
+    import asyncio
     try:
-        api_server.poll()
+        asyncio.run(api_server.run_async())
         
     except Exception as e:
         logger.add(f"{str(e)}, reset in 10 seconds","ERROR")
         time.sleep(10)
         microcontroller.reset()
-    
+
+else:
+    while True:
+        
+        try:
+            api_server.poll()
+            api_server.wait()
+            
+        except Exception as e:
+            logger.add(f"{str(e)}, reset in 10 seconds","ERROR")
+            time.sleep(10)
+            microcontroller.reset()
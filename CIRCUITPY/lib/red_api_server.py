@@ -1,19 +1,23 @@
-import board
-import digitalio
-import analogio
 import json
 import time
 import microcontroller
 import gc
-import re
 import red_utility
-from adafruit_httpserver import Server, Request, Response, POST
+from red_command import parse_request
+from red_gpio import PinTable
+from red_sampler import AdcSampler
+from red_capture import AdcCapture, TriggeredCapture, LogicCapture
+from red_inputs import InputEventQueue, PulseCounters
+from red_scheduler import AdaptivePoller, MIN_DELAY
+from red_logger import parse_time
+from red_static import StaticFileResponse, FileRangeResponse, file_variants, is_not_modified, not_modified_response
+from adafruit_httpserver import Server, Request, Response, MIMETypes, POST, NO_REQUEST, UNAUTHORIZED_401, NOT_FOUND_404, INTERNAL_SERVER_ERROR_500, FileNotExistsError, InvalidPathError
 
 
 class ApiServer:
     
     """
-    ApiServer(pool: socketpool.SocketPool, ip: str, port: int, api_key: str, logger: red_utility.Logger, debug: bool = True)
+    ApiServer(pool: socketpool.SocketPool, ip: str, port: int, api_key: str, logger: red_utility.Logger, pins: str = None, adc_rate: float = 10, adc_size: int = 64, capture_size: int = 2048, scope_size: int = 1024, logic_size: int = 1024, event_size: int = 64, chunk_size: int = 1024, debug: bool = True)
     Initializes the API server with the necessary network and hardware configurations.
     
     Parameters:
@@ -23,21 +27,40 @@ class ApiServer:
     api_key (str) - The API key used for authenticating requests.
     logger (red_utility.Logger) - The logger for recording server activities and errors.
     verbose_log (bool, optional) - Flag to enable or disable verbose log (default is True).
+    pins (str, optional) - Pin layout, see red_gpio.parse_pin_spec() (default is None for red_gpio.DEFAULT_PINS).
+    adc_rate (float, optional) - Background sampling rate of the analog inputs in Hz, 0 to disable (default is 10).
+    adc_size (int, optional) - Number of samples kept per analog input (default is 64).
+    capture_size (int, optional) - Maximum number of samples of a CAPTURE_ADC burst, preallocated (default is 2048).
+    scope_size (int, optional) - Maximum window of an ARM_SCOPE triggered capture, preallocated (default is 1024).
+    logic_size (int, optional) - CAPTURE_LOGIC buffer in 32-bit words, preallocated (default is 1024).
+    event_size (int, optional) - Number of input edge events kept for GET_INPUT_EVENTS (default is 64).
+    chunk_size (int, optional) - Size of the buffer HTML pages and static files are streamed through (default is 1024).
     debug (bool, optional) - Flag to enable or disable debug mode (default is False).
     Returns:
     VOID
     """
-    def __init__(self, pool, ip, port, api_key, logger, verbose_log=True, debug=False):
+    def __init__(self, pool, ip, port, api_key, logger, verbose_log=True, pins=None, adc_rate=10, adc_size=64, capture_size=2048, scope_size=1024, logic_size=1024, event_size=64, chunk_size=1024, debug=False):
         self.pool = pool
         self.ipv4 = ip
         self.port = port
         self.api_key = api_key
         self.logger = logger
         self.verbose_log = verbose_log
+        self.log_commands = verbose_log
+        self.pins = pins
+        self.adc_rate = adc_rate
+        self.adc_size = adc_size
+        self.capture_size = capture_size
+        self.scope_size = scope_size
+        self.logic_size = logic_size
+        self.event_size = event_size
+        self.static_buffer = bytearray(chunk_size)
+        self.file_etags = {}
         self.debug = debug
         
         self.poll_rate = 0
-        self.last_poll_ts = time.monotonic()
+        self.poll_rate_ns = 0
+        self.last_poll_ns = time.monotonic_ns()
         
         self.api_server = Server(self.pool, "/static", debug=self.debug)
         self.api_server.headers = {
@@ -45,6 +68,7 @@ class ApiServer:
             "Access-Control-Allow-Origin": "*",
         }
         self.init_hardwares()
+        self.load_commands()
         self.load_routes()
     
     """
@@ -53,17 +77,25 @@ class ApiServer:
     
     Parameters:
     poll_rate (float) - The interval between polls in seconds (default is 0.2 seconds).
+    adaptive (bool) - Use the adaptive scheduler instead of the fixed poll_rate: zero delay for a while after a
+    request, then an exponential backoff up to poll_rate (default is False).
     
     Returns:
     VOID
     """
-    def start(self, poll_rate=0.2):
+    def start(self, poll_rate=0.2, adaptive=False):
         self.poll_rate = poll_rate
+        self.poll_rate_ns = int(poll_rate * 1000000000)
+        self.adaptive = adaptive
+        self.poller = AdaptivePoller(max_delay=poll_rate)
         self.api_server.start(self.ipv4, self.port)
     
     """
     ApiServer.poll()
-    Polls the server to handle incoming requests. Restarts the server on encountering any errors.
+    Polls the server to handle incoming requests, at most once every poll_rate seconds or when the adaptive scheduler
+    says so. Restarts the server on encountering any errors.
+    Also drives the background samplers, see ApiServer.poll_hardwares(), so it should be called on every main loop
+    iteration, followed by ApiServer.wait().
     
     Parameters:
     VOID
@@ -72,17 +104,32 @@ class ApiServer:
     VOID
     """
     def poll(self):
-        if time.monotonic() - self.last_poll_ts > self.poll_rate:
-            try:
-                self.api_server.poll()
-                self.last_poll_ts = time.monotonic()
-            except Exception as e:
-                self.logger.add(f"{str(e)}","ERROR")
-        
+        self.poll_hardwares()
+        if self.adaptive:
+            if self.poller.due(time.monotonic_ns()):
+                self.poll_server()
+        elif time.monotonic_ns() - self.last_poll_ns > self.poll_rate_ns:
+            self.poll_server()
     
     """
-    ApiServer.init_hardwares()
-    Initializes the GPIO pins and other hardware components connected to the server.
+    ApiServer.next_due()
+    Tells when ApiServer.poll() has work next: the next server poll of the fixed rate or adaptive schedule, or the
+    next sample of a background sampler, whichever comes first.
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    int: time.monotonic_ns() of the next due work.
+    """
+    def next_due(self):
+        due = self.poller.next_poll if self.adaptive else self.last_poll_ns + self.poll_rate_ns
+        hardware_due = self.hardware_due()
+        return due if hardware_due is None or due < hardware_due else hardware_due
+    
+    """
+    ApiServer.wait()
+    Sleeps until ApiServer.next_due(), so the main loop idles instead of spinning between polls.
     
     Parameters:
     VOID
@@ -90,31 +137,152 @@ class ApiServer:
     Returns:
     VOID
     """
-    def init_hardwares(self):
-        self.board_led = digitalio.DigitalInOut(board.LED)
-        self.board_led.direction = digitalio.Direction.OUTPUT
-        
-        self.board_gp21 = digitalio.DigitalInOut(board.GP21)
-        self.board_gp21.direction = digitalio.Direction.OUTPUT
-        
-        self.board_gp20 = digitalio.DigitalInOut(board.GP20)
-        self.board_gp20.direction = digitalio.Direction.OUTPUT
+    def wait(self):
+        delay = self.next_due() - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / 1000000000)
+    
+    """
+    ApiServer.poll_server()
+    Polls the HTTP server once, handling at most one request, and records the poll in the scheduler counters; the
+    poll lag is only counted when the polls follow the adaptive schedule. An idle poll also lets the logger flush its
+    queue, see red_logger.Logger.poll().
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    str: The poll result of adafruit_httpserver, e.g. NO_REQUEST, or None on error.
+    """
+    def poll_server(self):
+        start = time.monotonic_ns()
+        result = None
+        try:
+            result = self.api_server.poll()
+            self.last_poll_ns = time.monotonic_ns()
+        except Exception as e:
+            self.logger.add(f"{str(e)}","ERROR")
+        self.poller.record(start, time.monotonic_ns(), result is not None and result != NO_REQUEST, self.adaptive)
+        if result == NO_REQUEST:
+            self.logger.poll()
+        return result
+    
+    """
+    ApiServer.poll_hardwares()
+    Drives the background ADC sampler, the triggered scope, the input edge detector and the counter snapshots.
+    Each of them only does work when its next sample is due.
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    VOID
+    """
+    def poll_hardwares(self):
+        self.adc_sampler.poll()
+        self.scope.poll()
+        self.input_events.poll()
+        self.pulse_counters.poll()
+    
+    """
+    ApiServer.hardware_due()
+    Tells when ApiServer.poll_hardwares() has work next.
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    int: time.monotonic_ns() of the earliest sample due, or None if no sampler is running.
+    """
+    def hardware_due(self):
+        due = None
+        for sampler in (self.adc_sampler, self.scope, self.input_events, self.pulse_counters):
+            sampler_due = sampler.next_due()
+            if sampler_due is not None and (due is None or sampler_due < due):
+                due = sampler_due
+        return due
+    
+    """
+    ApiServer.housekeeping()
+    Periodic maintenance, run between requests: closes the log rate limiting windows, flushes the queued log entries
+    once they have waited the logger's flush_interval (see red_logger.Logger.poll()) and collects garbage so requests
+    find a compacted heap.
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    VOID
+    """
+    def housekeeping(self):
+        self.logger.poll()
+        gc.collect()
+    
+    """
+    ApiServer.run_async(housekeeping_interval: float = 1.0)
+    Serves forever with asyncio instead of ApiServer.poll(). The HTTP server, the background samplers and the
+    housekeeping run as separate cooperative tasks that sleep until they have work: the server task follows the
+    adaptive schedule (every 1 ms for a while after a request, then backing off up to poll_rate, see
+    red_scheduler.AdaptivePoller), the hardware task sleeps until the next sample is due and at most poll_rate, so
+    a newly armed capture starts within poll_rate. Every sleep is at least red_scheduler.MIN_DELAY, so the tasks
+    never spin, even with poll_rate 0. Requires the asyncio library.
+    adafruit_httpserver has no awaitable accept, so the server task cannot wake on socket readiness: it polls on
+    the same schedule as ApiServer.poll() in adaptive mode, and the first request after an idle period still waits
+    up to poll_rate. This mode is not lower-latency than the main loop, it only lets other asyncio tasks run.
+    Use with asyncio.run(api_server.run_async()).
+    
+    Parameters:
+    housekeeping_interval (float, optional) - Seconds between ApiServer.housekeeping() runs (default is 1.0).
+    
+    Returns:
+    VOID
+    """
+    async def run_async(self, housekeeping_interval=1.0):
+        import asyncio
         
-        self.board_gp19 = digitalio.DigitalInOut(board.GP19)
-        self.board_gp19.direction = digitalio.Direction.OUTPUT
+        # The server task polls on the adaptive schedule
+        self.adaptive = True
+        max_delay = max(int(self.poll_rate * 1000000000), MIN_DELAY)
         
-        self.board_gp18 = digitalio.DigitalInOut(board.GP18)
-        self.board_gp18.direction = digitalio.Direction.INPUT
+        async def server_task():
+            while True:
+                self.poll_server()
+                await asyncio.sleep(max(MIN_DELAY, self.poller.next_poll - time.monotonic_ns()) / 1000000000)
         
-        self.board_gp17 = digitalio.DigitalInOut(board.GP17)
-        self.board_gp17.direction = digitalio.Direction.INPUT
+        async def hardware_task():
+            while True:
+                self.poll_hardwares()
+                due = self.hardware_due()
+                delay = max_delay if due is None else min(max(MIN_DELAY, due - time.monotonic_ns()), max_delay)
+                await asyncio.sleep(delay / 1000000000)
         
-        self.board_gp16 = digitalio.DigitalInOut(board.GP16)
-        self.board_gp16.direction = digitalio.Direction.INPUT
+        async def housekeeping_task():
+            while True:
+                await asyncio.sleep(housekeeping_interval)
+                self.housekeeping()
         
-        self.board_gp26_a0 = analogio.AnalogIn(board.GP26_A0)
-        self.board_gp27_a1 = analogio.AnalogIn(board.GP27_A1)
-        self.board_gp28_a2 = analogio.AnalogIn(board.GP28_A2)
+        await asyncio.gather(server_task(), hardware_task(), housekeeping_task())
+    
+    """
+    ApiServer.init_hardwares()
+    Initializes the GPIO pins and other hardware components connected to the server.
+    
+    Parameters:
+    VOID
+    
+    Returns:
+    VOID
+    """
+    def init_hardwares(self):
+        self.gpio = PinTable()
+        self.gpio.load_spec(self.pins)
+        self.adc_sampler = AdcSampler(self.gpio.analog_names, self.gpio.analog_ios, self.adc_rate, self.adc_size)
+        self.adc_capture = AdcCapture(self.capture_size)
+        self.scope = TriggeredCapture(self.scope_size)
+        self.logic_capture = LogicCapture(self.logic_size)
+        input_mask = ((1 << len(self.gpio.names)) - 1) & ~self.gpio.output_mask
+        self.input_events = InputEventQueue(self.gpio.names, self.gpio.read_mask, input_mask, self.event_size)
+        self.pulse_counters = PulseCounters(self.gpio.counter_names, self.gpio.counter_ios)
     
     """
     ApiServer.load_routes()
@@ -138,14 +306,8 @@ class ApiServer:
         Response: A response object with the content type set to 'text/html'.
         """
         @self.api_server.route("/")
-        def root_route_func(request: Request):  # pylint: disable=unused-argument
-            try:
-                content = self.load_file("/page/web_gui.html")
-                return Response(request, content, content_type='text/html')
-            except Exception as e:
-                self.logger.add(f"{str(e)}","ERROR")  
-            finally:
-                gc.collect()
+        def root_route_func(request: Request):
+            return self.serve_file(request, "/page", "web_gui.html")
         
         """
         Serves the Documentation HTML page for the doc directory(/doc).
@@ -157,14 +319,8 @@ class ApiServer:
         Response: A response object with the content type set to 'text/html'.
         """
         @self.api_server.route("/doc")
-        def doc_route_func(request: Request):  # pylint: disable=unused-argument
-            try:
-                content = self.load_file("/page/documentation.html")
-                return Response(request, content, content_type='text/html')
-            except Exception as e:
-                self.logger.add(f"{str(e)}","ERROR")  
-            finally:
-                gc.collect()
+        def doc_route_func(request: Request):
+            return self.serve_file(request, "/page", "documentation.html")
         
         """
         Processes various commands received via POST requests and provides appropriate responses(/cmd).
@@ -182,98 +338,26 @@ class ApiServer:
             result_data = ""
             
             try:
-                raw_request = request.raw_request.decode("utf8")
                 if self.debug:
-                    print(raw_request)
+                    print(request.raw_request.decode("utf8"))
                 
-                if not self.auth_cmd(raw_request):
+                parsed = parse_request(request.body.decode("utf8"))
+                if not self.auth_cmd(parsed):
                     self.logger.add("Unauthorized Request","WARN")
                     error_msg = "Authenication Required."
                     return Response(request, self.gen_json_response(result_data,error_code,error_msg), content_type='application/json')
                 
-                if "$CMD{SET_BOARD_LED=ON}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_LED=ON}")
-                    self.board_led.value = True
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_LED ON"
-                
-                if "$CMD{SET_BOARD_LED=OFF}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_LED=OFF}")
-                    self.board_led.value = False
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_LED OFF"
-                
-                if "$CMD{SET_BOARD_GP21=HIGH}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP21=HIGH}")
-                    self.board_gp21.value = True
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP21 HIGH"
-                
-                if "$CMD{SET_BOARD_GP21=LOW}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP21=LOW}")
-                    self.board_gp21.value = False
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP21 LOW"
-                    
-                if "$CMD{SET_BOARD_GP20=HIGH}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP20=HIGH}")
-                    self.board_gp20.value = True
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP20 HIGH"
-                
-                if "$CMD{SET_BOARD_GP20=LOW}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP20=LOW}")
-                    self.board_gp20.value = False
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP20 LOW"
-                    
-                if "$CMD{SET_BOARD_GP19=HIGH}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP19=HIGH}")
-                    self.board_gp19.value = True
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP19 HIGH"
-                
-                if "$CMD{SET_BOARD_GP19=LOW}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{SET_BOARD_GP19=LOW}")
-                    self.board_gp19.value = False
-                    error_code = 0
-                    error_msg = ""
-                    result_data = "BOARD_GP19 LOW"
-                
-                if "$CMD{GET_SYS_INFO}" in raw_request:
-                    self.verbose_log and self.logger.add("$CMD{GET_SYS_INFO}")
-                    error_code = 0
-                    error_msg = ""
-                    result_data = self.get_sys_info()
-                
-                if "$CMD{GET_SYS_LOG}" in raw_request:
-                    # $PARAM{LIMIT=15}, $PARAM{LEVEL=ERROR}
-                    limit = int(self.get_param(raw_request, "LIMIT")) or 5
-                    level = self.get_param(raw_request, 'LEVEL') or None
-                    self.verbose_log and self.logger.add("$CMD{GET_SYS_LOG},$PARAM{LIMIT="+str(limit)+"},$PARAM{LEVEL="+str(level)+"}")
-                    error_code = 0
-                    error_msg = ""
-                    result_data = self.logger.read(limit,level)
-                    
-                if "$CMD{CLEAR_SYS_LOG}" in raw_request:
-                    if self.logger.clear():
-                        error_code = 0
-                        error_msg = ""
-                        result_data = "System log cleared."
-                    else:
-                        error_msg = "Can not access log file."
-                    self.logger.add("$CMD{CLEAR_SYS_LOG}")
-                        
-                if "$CMD{RESET_SYS}" in raw_request:
-                    self.logger.add("$CMD{RESET_SYS}")
-                    microcontroller.reset()
+                results = self.execute_commands(parsed)
+                if len(results) == 1:
+                    error_code, error_msg, result_data = results[0]
+                elif len(results) > 1:
+                    failed = 0
+                    result_data = []
+                    for code, msg, data in results:
+                        failed += code != 0
+                        result_data.append({"error_code" : code, "error_msg" : msg, "data" : data})
+                    error_code = 1 if failed else 0
+                    error_msg = f"{failed} of {len(results)} commands failed." if failed else ""
                 
                 return Response(request, self.gen_json_response(result_data,error_code,error_msg), content_type='application/json')
             
@@ -283,62 +367,572 @@ class ApiServer:
             
             finally:
                 gc.collect()
+        
+        """
+        Streams the raw log file for tailing from a host (/syslog), with HTTP Range support: a client keeps the byte
+        offset it has read up to and asks for Range: bytes=<offset>- to get only what was appended since (206), or
+        416 when nothing was. ?segment=N sends the rotated segment N instead. X-Log-Sequence tells the number of the
+        log file, it changes when the log is rotated. Requires the API key in an X-API-Key header or ?api_key=.
+        
+        Parameters:
+        request (Request): The incoming request object.
+
+        Returns:
+        Response: The file or the range, 401, or 404 when there is no log file (read-only storage).
+        """
+        @self.api_server.route("/syslog")
+        def syslog_route_func(request: Request):
+            api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
+            if api_key != self.api_key:
+                self.logger.add("Unauthorized Request","WARN")
+                return Response(request, "Authenication Required.", status=UNAUTHORIZED_401)
+            try:
+                self.logger.flush()
+                segment = int(request.query_params.get("segment") or 0)
+                headers = {"Cache-Control" : "no-store", "X-Log-Sequence" : str(self.logger.sequence - segment)}
+                content_type = "application/octet-stream" if self.logger.binary else "text/plain"
+                return FileRangeResponse(request, self.logger.segment_name(segment), self.static_buffer, content_type, headers)
+            except (OSError, ValueError):
+                return Response(request, "Not Found", status=NOT_FOUND_404)
+            finally:
+                gc.collect()
+        
+        """
+        Serves the files under /static for any other GET path, e.g. /js/app.js is /static/js/app.js.
+        
+        Parameters:
+        request (Request): The incoming request object.
+
+        Returns:
+        Response: The file, or 404.
+        """
+        @self.api_server.route("/....")
+        def static_route_func(request: Request):
+            return self.serve_file(request, "/static", request.path[1:], "public, max-age=3600")
     
     """
-    ApiServer.auth_cmd(raw_request: str)
-    Authenticate the API key contained in the raw_request.
+    ApiServer.serve_file(request: Request, root_path: str, filename: str, cache_control: str = "no-cache")
+    Streams a file in chunks of the shared static buffer, see red_static.StaticFileResponse. Files do not change at
+    runtime, so their ETag is computed once per file and kept; a request whose If-None-Match matches gets a 304
+    without body. If the file has a pre-compressed sibling (filename + ".gz",
+    built on the host by tools/build_pages.py) and the client accepts gzip, the sibling is sent as is with
+    Content-Encoding: gzip.
+
+    Parameters:
+    request (Request): The incoming request object.
+    root_path (str): Directory holding the file.
+    filename (str): Path of the file relative to root_path.
+    cache_control (str, optional): Cache-Control header (default is "no-cache", browsers revalidate on every use).
+
+    Returns:
+    Response: The file, 304, or 404 if it does not exist or the path is invalid.
+    """
+    def serve_file(self, request, root_path, filename, cache_control="no-cache"):
+        try:
+            if ".." in filename:
+                return Response(request, "Not Found", status=NOT_FOUND_404)
+            path = root_path + "/" + filename
+            variants = self.file_etags.get(path)
+            if variants is None:
+                variants = file_variants(path)
+                self.file_etags[path] = variants
+            plain, gzipped = variants
+            send_gzip = gzipped is not None and "gzip" in (request.headers.get("Accept-Encoding") or "")
+            etag = gzipped if send_gzip else plain
+            headers = {"ETag" : etag, "Cache-Control" : cache_control}
+            if gzipped is not None:
+                headers["Vary"] = "Accept-Encoding"
+            if is_not_modified(request, etag):
+                return not_modified_response(request, headers)
+            if send_gzip:
+                headers["Content-Encoding"] = "gzip"
+                return StaticFileResponse(request, filename + ".gz", root_path, self.static_buffer, headers=headers, content_type=MIMETypes.get_for_filename(filename))
+            return StaticFileResponse(request, filename, root_path, self.static_buffer, headers=headers)
+        except (OSError, FileNotExistsError, InvalidPathError):
+            return Response(request, "Not Found", status=NOT_FOUND_404)
+        except Exception as e:
+            self.logger.add(f"{str(e)}","ERROR")
+            return Response(request, str(e), status=INTERNAL_SERVER_ERROR_500)
+        finally:
+            gc.collect()
     
+    """
+    ApiServer.load_commands()
+    Builds the dispatch table mapping each command name to its handler.
+    A handler is called as handler(value: str, parsed: CommandRequest, text: str) and returns an (error_code, error_msg, data) tuple, or None to leave the result unchanged.
+
     Parameters:
-    raw_request (str): A string containing the API key in the format $AUTH{API_KEY=your_api_key}.
+    VOID
 
     Returns:
-    bool: True if the API key is valid, False otherwise.
+    VOID
     """
-    def auth_cmd(self, raw_request):
-        pattern = r"\$AUTH\{API_KEY=([^}]+)\}"
-        match = re.search(pattern, raw_request)
-        if match:
-            extract_api_key = match.group(1)
-            if extract_api_key == self.api_key:
-                return True
-        return False
+    def load_commands(self):
+        self.staged_writes = []
+        self.cmd_handlers = {
+            "SET_GPIO_MASK" : self.cmd_set_gpio_mask,
+            "GET_GPIO_MASK" : self.cmd_get_gpio_mask,
+            "SET_PIN" : self.cmd_set_pin,
+            "GET_PIN" : self.cmd_get_pin,
+            "GET_PINS" : self.cmd_get_pins,
+            "GET_ADC" : self.cmd_get_adc,
+            "CAPTURE_ADC" : self.cmd_capture_adc,
+            "GET_CAPTURE" : self.cmd_get_capture,
+            "ARM_SCOPE" : self.cmd_arm_scope,
+            "GET_SCOPE" : self.cmd_get_scope,
+            "DISARM_SCOPE" : self.cmd_disarm_scope,
+            "CAPTURE_LOGIC" : self.cmd_capture_logic,
+            "GET_INPUT_EVENTS" : self.cmd_get_input_events,
+            "GET_COUNTERS" : self.cmd_get_counters,
+            "RESET_COUNTERS" : self.cmd_reset_counters,
+            "GET_FREQUENCY" : self.cmd_get_frequency,
+            "GET_SERVER_STATS" : self.cmd_get_server_stats,
+            "GET_SYS_INFO" : self.cmd_get_sys_info,
+            "GET_SYS_LOG" : self.cmd_get_sys_log,
+            "CLEAR_SYS_LOG" : self.cmd_clear_sys_log,
+            "RESET_SYS" : self.cmd_reset_sys,
+        }
+        # $CMD{SET_BOARD_xxx=HIGH|LOW} for every digital output, ON|OFF for the onboard LED
+        for name in self.gpio.names:
+            if self.gpio.get_mode(name) == "OUT":
+                self.cmd_handlers["SET_BOARD_" + name] = self.make_set_board_handler(name)
     
     """
-    ApiServer.get_param(raw_request: str, key_name: str)
-    Retrieve a parameter value from a raw_request string based on the key_name.
+    ApiServer.make_set_board_handler(name: str)
+    Creates the $CMD{SET_BOARD_xxx} handler of a digital output.
+
+    Parameters:
+    name (str): Name of the pin.
+
+    Returns:
+    function: The handler.
+    """
+    def make_set_board_handler(self, name):
+        pin = self.gpio.get(name)
+        label = "BOARD_" + name
+        on_value, off_value = ("ON", "OFF") if name == "LED" else ("HIGH", "LOW")
+        return lambda value, parsed, text: self.cmd_set_output(pin, label, value, on_value, off_value, text)
     
+    """
+    ApiServer.execute_commands(parsed: CommandRequest)
+    Runs the parsed commands in request order, each one reading its own parameters, see red_command.CommandRequest.
+    GPIO writes are staged by the handlers and applied after each command, or, with $PARAM{ATOMIC=1} anywhere in the
+    request, only once every command in the batch has succeeded. The verbose log entry of a command that staged
+    writes is added once they are applied, so an aborted batch logs none. Whether command entries are logged at all
+    is decided once per request, from verbose_log and red_logger.Logger.enabled(), so the handlers skip the
+    Logger.add() calls no sink would keep.
+
     Parameters:
-    raw_request (str): The request string containing parameters in the format $PARAM{key=value}.
-    key_name (str): The key whose value is to be retrieved.
+    parsed (CommandRequest): The parsed request.
 
     Returns:
-    str: The value of the parameter if found, or False if not found.
+    list: One (error_code, error_msg, data) tuple per command, in request order.
     """
-    def get_param(self, raw_request, key_name):
-        pattern = pattern = r'\$PARAM\{' + key_name + r'\s*=\s*([^}]*)\}'
-        match = re.search(pattern, raw_request)
-        if match:
-            return match.group(1).strip()
-        return False
+    def execute_commands(self, parsed):
+        atomic = parsed.params.get("ATOMIC") in ("1", "TRUE", "ON")
+        self.log_commands = self.verbose_log and self.logger.enabled("INFO")
+        results = []
+        pending = []
+        staged_at = []
+        failed = False
+        for name, value, text, params in parsed.commands:
+            parsed.scope = params
+            handler = self.cmd_handlers.get(name)
+            try:
+                result = handler(value, parsed, text) if handler is not None else None
+            except Exception as e:
+                self.logger.add(f"Command Error: {str(e)}","ERROR")
+                result = (1, str(e), "")
+            if result is None:
+                result = (1, "Invalid command. Please check the documentation.", "")
+            failed = failed or result[0] != 0
+            if self.staged_writes:
+                if atomic:
+                    staged_at.append((len(results), text))
+                    pending.extend(self.staged_writes)
+                else:
+                    self.apply_writes(self.staged_writes)
+                    self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+                self.staged_writes = []
+            results.append(result)
+        parsed.scope = parsed.params
+        
+        if atomic:
+            if failed:
+                for index, text in staged_at:
+                    results[index] = (1, "Batch aborted, GPIO write not applied.", "")
+            else:
+                self.apply_writes(pending)
+                for index, text in staged_at:
+                    self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        return results
     
     """
-    ApiServer.load_file(filename: str)
-    Load and read the contents of a specified file.
+    ApiServer.apply_writes(writes: list)
+    Applies staged GPIO writes back to back.
 
     Parameters:
-    filename (str): The path to the file to be read.
+    writes (list): (pin, value) tuples.
+
+    Returns:
+    VOID
+    """
+    def apply_writes(self, writes):
+        for pin, value in writes:
+            pin.value = value
+    
+    """
+    ApiServer.cmd_set_output(pin: digitalio.DigitalInOut, label: str, value: str, on_value: str, off_value: str, text: str)
+    Handles $CMD{SET_BOARD_xxx=on_value|off_value} for a digital output pin. The write is staged, see ApiServer.execute_commands().
 
     Returns:
-    str: The content of the file if successful, or an empty string if an error occurs.
+    tuple: (error_code, error_msg, data), or None if value is neither on_value nor off_value.
+    """
+    def cmd_set_output(self, pin, label, value, on_value, off_value, text):
+        if value != on_value and value != off_value:
+            return None
+        self.staged_writes.append((pin, value == on_value))
+        return 0, "", label + " " + value
+    
     """
-    def load_file(self, filename):
+    ApiServer.cmd_set_gpio_mask(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{SET_GPIO_MASK=mask:value}, e.g. $CMD{SET_GPIO_MASK=0x0F:0x05}. Every output pin selected by mask is set
+    to the matching bit of value in one staged write. Bit order is the order of GET_GPIO_MASK "pins".
+    """
+    def cmd_set_gpio_mask(self, value, parsed, text):
+        if value is None or ":" not in value:
+            return 1, "Expected $CMD{SET_GPIO_MASK=mask:value}.", ""
+        mask, level = value.split(":", 1)
+        mask = int(mask, 0)
+        level = int(level, 0)
+        if mask < 0 or level < 0:
+            return 1, "Mask and value must be positive.", ""
+        self.staged_writes.extend(self.gpio.stage_mask(mask, level))
+        return 0, "", {"mask" : mask, "value" : level & mask}
+    
+    """
+    ApiServer.cmd_get_gpio_mask(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_GPIO_MASK}. Reads every digital pin in one pass.
+    """
+    def cmd_get_gpio_mask(self, value, parsed, text):
+        self.log_commands and self.logger.add("$CMD{GET_GPIO_MASK}")
+        return 0, "", {"value" : self.gpio.read_mask(), "output_mask" : self.gpio.output_mask, "pins" : self.gpio.names}
+    
+    """
+    ApiServer.cmd_set_pin(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{SET_PIN=name:level} where level is HIGH, LOW, ON, OFF, 1 or 0, e.g. $CMD{SET_PIN=GP21:HIGH}.
+    """
+    def cmd_set_pin(self, value, parsed, text):
+        if value is None or ":" not in value:
+            return 1, "Expected $CMD{SET_PIN=name:level}.", ""
+        name, level = value.split(":", 1)
+        name = name.strip().upper()
+        level = level.strip().upper()
+        if self.gpio.get_mode(name) != "OUT":
+            return 1, f"{name} is not a configured output.", ""
+        if level in ("HIGH", "ON", "1"):
+            state = True
+        elif level in ("LOW", "OFF", "0"):
+            state = False
+        else:
+            return 1, f"Invalid level {level}.", ""
+        self.staged_writes.append((self.gpio.get(name), state))
+        return 0, "", {"name" : name, "value" : state}
+    
+    """
+    ApiServer.cmd_get_pin(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_PIN=name}. Digital pins read as bool, analog inputs as int and counters as their count.
+    """
+    def cmd_get_pin(self, value, parsed, text):
+        if value is None:
+            return 1, "Expected $CMD{GET_PIN=name}.", ""
+        name = value.strip().upper()
+        mode = self.gpio.get_mode(name)
+        if mode is None:
+            return 1, f"{name} is not a configured pin.", ""
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        if mode == "CNT":
+            reading = self.gpio.counter_ios[self.gpio.counter_index[name]].count
+        elif mode == "AIN":
+            reading = self.gpio.get_analog(name).value
+        else:
+            reading = self.gpio.get(name).value
+        return 0, "", {"name" : name, "mode" : mode, "value" : reading}
+    
+    """
+    ApiServer.cmd_get_pins(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_PINS}. Lists every configured pin with its mode and value.
+    """
+    def cmd_get_pins(self, value, parsed, text):
+        self.log_commands and self.logger.add("$CMD{GET_PINS}")
+        pins = []
+        for name, io in zip(self.gpio.names, self.gpio.ios):
+            pins.append({"name" : name, "mode" : self.gpio.get_mode(name), "value" : io.value})
+        for name, io in zip(self.gpio.analog_names, self.gpio.analog_ios):
+            pins.append({"name" : name, "mode" : "AIN", "value" : io.value})
+        for name, io in zip(self.gpio.counter_names, self.gpio.counter_ios):
+            pins.append({"name" : name, "mode" : "CNT", "value" : io.count})
+        return 0, "", pins
+    
+    """
+    ApiServer.cmd_get_adc(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_ADC} or $CMD{GET_ADC=name}, $PARAM{SAMPLES=16}. Returns min, max, mean and the last SAMPLES
+    samples of the background sampler for every analog input, or only for the named one.
+    """
+    def cmd_get_adc(self, value, parsed, text):
+        limit = int(parsed.get_param("SAMPLES") or 0)
+        if value is None:
+            channels = range(len(self.gpio.analog_names))
+        elif value in self.gpio.analog_index:
+            channels = (self.gpio.analog_index[value],)
+        else:
+            return 1, f"{value} is not a configured analog input.", ""
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        result = {"rate" : self.adc_sampler.rate}
+        for channel in channels:
+            result[self.gpio.analog_names[channel]] = self.adc_sampler.get_stats(channel, limit)
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_capture_adc(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{CAPTURE_ADC=name}, $PARAM{RATE=100000}, $PARAM{LENGTH=1024}, $PARAM{COUNT=512}. Captures a burst of
+    one analog input at RATE samples per second through DMA, the input's AnalogIn is released for the duration.
+    Returns the first COUNT samples (default is all) as base64 of little-endian uint16, see GET_CAPTURE for the rest.
+    """
+    def cmd_capture_adc(self, value, parsed, text):
+        channel = self.gpio.analog_index.get(value)
+        if channel is None:
+            return 1, f"{value} is not a configured analog input.", ""
+        rate = int(parsed.get_param("RATE") or 100000)
+        length = int(parsed.get_param("LENGTH") or self.capture_size)
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        pin = self.gpio.release_analog(channel)
         try:
-            with open(filename, 'r') as file:
-                content = file.read()
-            return content
-        except Exception as e:
-            print('error:'+str(e))
-            return ''
+            self.adc_capture.capture(value, pin, rate, length)
+        finally:
+            self.gpio.restore_analog(channel)
+        return self.cmd_get_capture(None, parsed, text)
+    
+    """
+    ApiServer.cmd_get_capture(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_CAPTURE}, $PARAM{OFFSET=512}, $PARAM{COUNT=512}. Downloads a range of the last CAPTURE_ADC
+    burst as base64 of little-endian uint16, so large captures can be fetched in chunks.
+    """
+    def cmd_get_capture(self, value, parsed, text):
+        offset = int(parsed.get_param("OFFSET") or 0)
+        count = int(parsed.get_param("COUNT") or 0) or None
+        result = self.adc_capture.get_info()
+        result["offset"] = offset
+        result["data"] = self.adc_capture.encode(offset, count)
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_arm_scope(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{ARM_SCOPE=name}, $PARAM{TRIGGER=RISING}, $PARAM{LEVEL=32768}, $PARAM{PRE=256}, $PARAM{POST=256}, $PARAM{RATE=1000}.
+    Samples the analog input from the main loop until the trigger fires and freezes the window around it, see GET_SCOPE.
+    """
+    def cmd_arm_scope(self, value, parsed, text):
+        channel = self.gpio.analog_index.get(value)
+        if channel is None:
+            return 1, f"{value} is not a configured analog input.", ""
+        trigger = parsed.get_param("TRIGGER") or "RISING"
+        level = int(parsed.get_param("LEVEL") or 32768)
+        post = int(parsed.get_param("POST") or self.scope_size // 2)
+        pre = int(parsed.get_param("PRE") or self.scope_size - post)
+        rate = float(parsed.get_param("RATE") or 1000)
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        self.scope.arm(value, self.gpio.analog_ios, channel, trigger, level, pre, post, rate)
+        return 0, "", self.scope.get_status()
+    
+    """
+    ApiServer.cmd_get_scope(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_SCOPE}, $PARAM{OFFSET=0}, $PARAM{COUNT=256}. Returns the scope status and, once DONE, COUNT samples
+    (default all) of the frozen window from OFFSET as base64 of little-endian uint16. Index PRE is the trigger sample.
+    """
+    def cmd_get_scope(self, value, parsed, text):
+        result = self.scope.get_status()
+        if self.scope.state == self.scope.DONE:
+            offset = int(parsed.get_param("OFFSET") or 0)
+            count = int(parsed.get_param("COUNT") or 0) or None
+            result["offset"] = offset
+            result["data"] = self.scope.encode(offset, count)
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_disarm_scope(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{DISARM_SCOPE}. Stops an armed capture or discards a frozen one.
+    """
+    def cmd_disarm_scope(self, value, parsed, text):
+        self.log_commands and self.logger.add("$CMD{DISARM_SCOPE}")
+        self.scope.disarm()
+        return 0, "", self.scope.get_status()
+    
+    """
+    ApiServer.cmd_capture_logic(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{CAPTURE_LOGIC=GP16}, $PARAM{PINS=3}, $PARAM{RATE=1000000}, $PARAM{SAMPLES=4096}. Samples PINS consecutive
+    inputs starting at the given board pin with a PIO state machine and returns the trace run-length encoded as a
+    flat [sample, run, ...] list where bit i of a sample is pin first + i. The inputs are released for the duration.
+    """
+    def cmd_capture_logic(self, value, parsed, text):
+        if value is None or not value.startswith("GP") or not value[2:].isdigit():
+            return 1, "Expected $CMD{CAPTURE_LOGIC=GPxx}.", ""
+        pin_count = int(parsed.get_param("PINS") or 1)
+        rate = int(parsed.get_param("RATE") or 1000000)
+        samples = int(parsed.get_param("SAMPLES") or 4096)
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        first_pin, bits = self.gpio.release_range(int(value[2:]), pin_count)
+        try:
+            self.logic_capture.capture(first_pin, pin_count, rate, samples)
+        finally:
+            self.gpio.restore_digital(bits)
+        result = self.logic_capture.get_trace()
+        result["first_pin"] = value
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_get_input_events(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_INPUT_EVENTS}, $PARAM{CURSOR=0}, $PARAM{LIMIT=50}. Returns the rise and fall events of the digital
+    inputs from CURSOR on and the cursor to send next time.
+    """
+    def cmd_get_input_events(self, value, parsed, text):
+        cursor = int(parsed.get_param("CURSOR") or 0)
+        limit = int(parsed.get_param("LIMIT") or 50)
+        return 0, "", self.input_events.read(cursor, limit)
+    
+    """
+    ApiServer.cmd_get_counters(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_COUNTERS}. Returns the rising edge count of every CNT pin.
+    """
+    def cmd_get_counters(self, value, parsed, text):
+        return 0, "", self.pulse_counters.get_counts()
+    
+    """
+    ApiServer.cmd_reset_counters(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{RESET_COUNTERS} or $CMD{RESET_COUNTERS=name}. Resets every counter, or only the named one.
+    """
+    def cmd_reset_counters(self, value, parsed, text):
+        index = None
+        if value is not None:
+            index = self.gpio.counter_index.get(value)
+            if index is None:
+                return 1, f"{value} is not a configured counter.", ""
+        self.log_commands and self.logger.add("$CMD{%s}", template=text, args=(text,))
+        self.pulse_counters.reset(index)
+        return 0, "", self.pulse_counters.get_counts()
+    
+    """
+    ApiServer.cmd_get_frequency(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_FREQUENCY} or $CMD{GET_FREQUENCY=name}, $PARAM{WINDOW=1}. Returns the edge rate in Hz of every
+    counter, or only the named one, over a sliding window of about WINDOW seconds (up to 3.75).
+    """
+    def cmd_get_frequency(self, value, parsed, text):
+        window = float(parsed.get_param("WINDOW") or 1)
+        if value is None:
+            indexes = range(len(self.gpio.counter_names))
+        elif value in self.gpio.counter_index:
+            indexes = (self.gpio.counter_index[value],)
+        else:
+            return 1, f"{value} is not a configured counter.", ""
+        result = {}
+        for index in indexes:
+            result[self.gpio.counter_names[index]] = self.pulse_counters.get_frequency(index, window)
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_get_server_stats(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_SERVER_STATS}, $PARAM{RESET=1}. Returns the scheduler counters: polls, requests, current delay,
+    poll lag and the share of time spent serving, polling idle and elsewhere. RESET=1 restarts them afterwards.
+    """
+    def cmd_get_server_stats(self, value, parsed, text):
+        result = self.poller.get_stats()
+        result["adaptive"] = self.adaptive
+        if parsed.get_param("RESET") == "1":
+            self.poller.reset_stats()
+        return 0, "", result
+    
+    """
+    ApiServer.cmd_get_sys_info(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_SYS_INFO}.
+    """
+    def cmd_get_sys_info(self, value, parsed, text):
+        self.log_commands and self.logger.add("$CMD{GET_SYS_INFO}")
+        return 0, "", self.get_sys_info()
+    
+    """
+    ApiServer.cmd_get_sys_log(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{GET_SYS_LOG}, $PARAM{LIMIT=15}, $PARAM{LEVEL=ERROR}, $PARAM{GROUP=SYS}.
+    With $PARAM{CURSOR=cursor} (empty for the first page), $PARAM{SINCE=time} or $PARAM{UNTIL=time} the data is a
+    page {"entries": [...], "cursor": "...", "reset": bool}, see red_logger.Logger.query(); times are epoch seconds or
+    'YYYY-MM-DD HH:MM:SS'. reset is true when a non-empty cursor could not be continued, e.g. after a reboot, and the
+    page holds the newest entries instead, so the client drops what it has.
+    """
+    def cmd_get_sys_log(self, value, parsed, text):
+        limit = int(parsed.get_param("LIMIT")) or 5
+        level = parsed.get_param("LEVEL") or None
+        group = parsed.get_param("GROUP") or None
+        cursor = parsed.get_param("CURSOR")
+        since = parsed.get_param("SINCE")
+        until = parsed.get_param("UNTIL")
+        self.log_commands and self.logger.add("$CMD{GET_SYS_LOG},$PARAM{LIMIT=%s},$PARAM{LEVEL=%s}", args=(limit, level))
+        if cursor is False and since is False and until is False:
+            return 0, "", self.logger.read(limit,level,group)
+        reset = bool(cursor) and not self.logger.resumes(self.logger.parse_cursor(cursor))
+        entries, cursor = self.logger.query(limit, level, group, self.parse_log_time(since), self.parse_log_time(until), cursor or None)
+        return 0, "", {"entries" : entries, "cursor" : cursor, "reset" : reset}
+    
+    """
+    ApiServer.parse_log_time(value: str)
+    Parses a SINCE/UNTIL parameter of GET_SYS_LOG.
+    
+    Parameters:
+    value (str): Epoch seconds or 'YYYY-MM-DD HH:MM:SS', False or empty when absent.
+    
+    Returns:
+    int: Epoch seconds, or None when absent.
+    
+    Raises:
+    ValueError: If the value is malformed.
+    """
+    def parse_log_time(self, value):
+        if not value:
+            return None
+        if "-" in value:
+            return parse_time(value)
+        return int(value)
+    
+    """
+    ApiServer.cmd_clear_sys_log(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{CLEAR_SYS_LOG}.
+    """
+    def cmd_clear_sys_log(self, value, parsed, text):
+        if self.logger.clear():
+            result = (0, "", "System log cleared.")
+        else:
+            result = (1, "Can not access log file.", "")
+        self.logger.add("$CMD{CLEAR_SYS_LOG}")
+        return result
+    
+    """
+    ApiServer.cmd_reset_sys(value: str, parsed: CommandRequest, text: str)
+    Handles $CMD{RESET_SYS}.
+    """
+    def cmd_reset_sys(self, value, parsed, text):
+        self.logger.add("$CMD{RESET_SYS}")
+        self.logger.flush()
+        microcontroller.reset()
+    
+    """
+    ApiServer.auth_cmd(parsed: CommandRequest)
+    Authenticate the API key contained in the parsed request.
+    
+    Parameters:
+    parsed (CommandRequest): The parsed request, its api_key comes from $AUTH{API_KEY=your_api_key}.
+
+    Returns:
+    bool: True if the API key is valid, False otherwise.
+    """
+    def auth_cmd(self, parsed):
+        return parsed.api_key is not None and parsed.api_key == self.api_key
     
     """
     ApiServer.gen_json_response(data: dict, error_code: int = 0, error_msg: str = "")
@@ -369,6 +963,11 @@ class ApiServer:
     dict: A dictionary containing various system information metrics.
     """
     def get_sys_info(self):
+        gpio = {}
+        for name, io in zip(self.gpio.names, self.gpio.ios):
+            gpio["board." + name] = io.value
+        for name, io in zip(self.gpio.analog_names, self.gpio.analog_ios):
+            gpio["board." + name] = io.value
         result = {
             "cpu_temp" : microcontroller.cpu.temperature,
             "cpu_freq" : microcontroller.cpu.frequency,
@@ -376,20 +975,7 @@ class ApiServer:
             "server_ip" : self.ipv4,
             "server_port" : self.port,
             "storage_ro" : self.logger.get_readonly(),
-            "GPIO" : {
-                "board.LED" : self.board_led.value,
-                "board.GP21" : self.board_gp21.value,
-                "board.GP20" : self.board_gp20.value,
-                "board.GP19" : self.board_gp19.value,
-                "board.GP18" : self.board_gp18.value,
-                "board.GP17" : self.board_gp17.value,
-                "board.GP16" : self.board_gp16.value,
-                "board.GP26_A0" : self.board_gp26_a0.value,
-                "board.GP27_A1" : self.board_gp27_a1.value,
-                "board.GP28_A2" : self.board_gp28_a2.value
-                
-            }
-            
+            "GPIO" : gpio
         }
         return result
         
\ No newline at end of file
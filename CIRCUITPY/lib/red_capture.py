@@ -0,0 +1,580 @@
+import math
+import time
+import binascii
+from array import array
+
+try:
+    import analogbufio
+except ImportError:
+    analogbufio = None
+
+try:
+    import rp2pio
+except ImportError:
+    rp2pio = None
+
+# RP2040 ADC conversion limit
+MAX_ADC_RATE = 500000
+# RP2040 PIO clock range, one sample per PIO cycle
+MIN_LOGIC_RATE = 2000
+MAX_LOGIC_RATE = 125000000
+
+"""
+encode_samples(buffer: array, length: int, offset: int = 0, count: int = None)
+Encodes a range of the first length samples of buffer as base64 of little-endian uint16.
+
+Parameters:
+buffer (array): array('H') holding the samples.
+length (int): Number of valid samples in buffer.
+offset (int): Index of the first sample.
+count (int, optional): Number of samples (default is None for the rest).
+
+Returns:
+str: The base64 text.
+"""
+def encode_samples(buffer, length, offset=0, count=None):
+    offset = max(0, min(offset, length))
+    end = length if count is None else min(length, offset + count)
+    return binascii.b2a_base64(memoryview(buffer)[offset:end], newline=False).decode()
+
+
+class SimulatedBufferedIn:
+
+    """
+    SimulatedBufferedIn(pin: object, sample_rate: int)
+    Stand-in for analogbufio.BufferedIn on hosts without the module. Fills buffers with a 1 kHz sine wave
+    sampled at sample_rate, so the capture and encoding path can run on a desktop Python.
+
+    Parameters:
+    pin (object): Ignored.
+    sample_rate (int): Samples per second.
+
+    Returns: VOID
+    """
+    def __init__(self, pin, sample_rate):
+        self.pin = pin
+        self.sample_rate = sample_rate
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deinit()
+
+    """
+    SimulatedBufferedIn.readinto(buffer: array, loop: bool = False)
+    Fills buffer with samples.
+
+    Parameters:
+    buffer (array): array('H') to fill.
+    loop (bool): Ignored.
+
+    Returns:
+    int: Number of samples written.
+    """
+    def readinto(self, buffer, loop=False):
+        step = 2 * math.pi * 1000 / self.sample_rate
+        for i in range(len(buffer)):
+            buffer[i] = int(32767.5 + 32767 * math.sin(i * step))
+        return len(buffer)
+
+    def deinit(self):
+        pass
+
+
+class AdcCapture:
+
+    """
+    AdcCapture(size: int = 2048, buffered_in: type = None)
+    Burst capture of one analog input into a preallocated array('H'). Uses analogbufio.BufferedIn (DMA) when
+    available, SimulatedBufferedIn otherwise.
+
+    Parameters:
+    size (int): Maximum number of samples per capture, allocated once.
+    buffered_in (type, optional): Class used for the capture (default is None for analogbufio.BufferedIn or SimulatedBufferedIn).
+
+    Returns: VOID
+    """
+    def __init__(self, size=2048, buffered_in=None):
+        self.size = size
+        self.buffer = array('H', (0 for _ in range(size)))
+        if buffered_in is None:
+            buffered_in = analogbufio.BufferedIn if analogbufio is not None else SimulatedBufferedIn
+        self.buffered_in = buffered_in
+        self.length = 0
+        self.rate = 0
+        self.name = None
+
+    """
+    AdcCapture.capture(name: str, pin: microcontroller.Pin, rate: int, length: int)
+    Captures length samples of pin at rate. The pin must not be held by an AnalogIn during the capture.
+
+    Parameters:
+    name (str): Name of the input, kept with the capture.
+    pin (microcontroller.Pin): The board pin, e.g. board.GP26_A0.
+    rate (int): Samples per second, up to MAX_ADC_RATE.
+    length (int): Number of samples, up to the buffer size.
+
+    Returns:
+    int: Number of samples captured.
+
+    Raises:
+    ValueError: If rate or length is out of range.
+    """
+    def capture(self, name, pin, rate, length):
+        if rate < 1 or rate > MAX_ADC_RATE:
+            raise ValueError(f"Rate must be between 1 and {MAX_ADC_RATE}.")
+        if length < 1 or length > self.size:
+            raise ValueError(f"Length must be between 1 and {self.size}.")
+        view = memoryview(self.buffer)[:length]
+        with self.buffered_in(pin, sample_rate=rate) as adc:
+            self.length = adc.readinto(view)
+        self.rate = rate
+        self.name = name
+        return self.length
+
+    """
+    AdcCapture.encode(offset: int = 0, count: int = None)
+    Encodes a range of the last capture as base64 of little-endian uint16 samples.
+
+    Parameters:
+    offset (int): Index of the first sample.
+    count (int, optional): Number of samples (default is None for the rest of the capture).
+
+    Returns:
+    str: The base64 text.
+    """
+    def encode(self, offset=0, count=None):
+        return encode_samples(self.buffer, self.length, offset, count)
+
+    """
+    AdcCapture.get_info()
+    Describes the last capture.
+
+    Parameters: VOID
+
+    Returns:
+    dict: name, rate and length of the last capture.
+    """
+    def get_info(self):
+        return {"name" : self.name, "rate" : self.rate, "length" : self.length}
+
+
+class TriggeredCapture:
+
+    IDLE = "IDLE"
+    ARMED = "ARMED"
+    TRIGGERED = "TRIGGERED"
+    DONE = "DONE"
+    TRIGGERS = ("RISING", "FALLING", "ABOVE", "BELOW")
+
+    """
+    TriggeredCapture(size: int = 1024)
+    Armable oscilloscope-style capture of one analog input. Once armed, poll() samples the input into a circular
+    array('H') until the trigger fires, then keeps sampling for the post-trigger window and freezes, so the frozen
+    window holds the pre-trigger and post-trigger samples around the event.
+
+    Parameters:
+    size (int): Maximum window (pre + post) in samples, allocated once.
+
+    Returns: VOID
+    """
+    def __init__(self, size=1024):
+        self.size = size
+        self.buffer = array('H', (0 for _ in range(size)))
+        self.state = self.IDLE
+        self.name = None
+        self.channels = None
+        self.channel = 0
+        self.length = 0
+
+    """
+    TriggeredCapture.arm(name: str, channels: list, channel: int, trigger: str, level: int, pre: int, post: int, rate: float)
+    Starts sampling and waits for the trigger. The trigger is only evaluated once pre samples are buffered.
+
+    Parameters:
+    name (str): Name of the input, kept with the capture.
+    channels (list): Analog inputs, objects with a .value property. The list is indexed on every sample.
+    channel (int): Index of the input in channels.
+    trigger (str): RISING or FALLING (crossing level), ABOVE or BELOW (compared to level).
+    level (int): Trigger level, 0 to 65535.
+    pre (int): Samples kept before the trigger.
+    post (int): Samples kept from the trigger on, at least 1.
+    rate (float): Samples per second.
+
+    Returns: VOID
+
+    Raises:
+    ValueError: If an argument is out of range.
+    """
+    def arm(self, name, channels, channel, trigger, level, pre, post, rate):
+        if trigger not in self.TRIGGERS:
+            raise ValueError("Trigger must be one of " + ", ".join(self.TRIGGERS) + ".")
+        if pre < 0 or post < 1 or pre + post > self.size:
+            raise ValueError(f"PRE + POST must be between 1 and {self.size}.")
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.name = name
+        self.channels = channels
+        self.channel = channel
+        self.trigger = trigger
+        self.level = level
+        self.pre = pre
+        self.post = post
+        self.rate = rate
+        self.interval_ns = int(1000000000 / rate)
+        self.next_ns = time.monotonic_ns()
+        self.head = 0
+        self.count = 0
+        self.remaining = post
+        self.previous = None
+        self.length = 0
+        self.trigger_value = None
+        self.state = self.ARMED
+
+    """
+    TriggeredCapture.disarm()
+    Stops an armed capture and discards its samples.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def disarm(self):
+        self.state = self.IDLE
+        self.channels = None
+        self.length = 0
+
+    """
+    TriggeredCapture.poll()
+    Takes one sample if the capture is armed and the next sample is due. Meant to be called on every main loop iteration.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def poll(self):
+        if self.state is not self.ARMED and self.state is not self.TRIGGERED:
+            return
+        now = time.monotonic_ns()
+        if now < self.next_ns:
+            return
+        self.next_ns += self.interval_ns
+        if self.next_ns < now:
+            self.next_ns = now + self.interval_ns
+
+        sample = self.channels[self.channel].value
+        self.buffer[self.head] = sample
+        self.head = (self.head + 1) % self.size
+        self.count += 1
+
+        if self.state is self.ARMED:
+            previous = self.previous
+            self.previous = sample
+            if self.count <= self.pre or not self.check_trigger(previous, sample):
+                return
+            self.state = self.TRIGGERED
+            self.trigger_value = sample
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.freeze()
+
+    """
+    TriggeredCapture.next_due()
+    Tells when poll() has work next, so the main loop can sleep until then.
+
+    Parameters: VOID
+
+    Returns:
+    int: time.monotonic_ns() of the next sample, or None if the capture is not armed.
+    """
+    def next_due(self):
+        if self.state is not self.ARMED and self.state is not self.TRIGGERED:
+            return None
+        return self.next_ns
+
+    """
+    TriggeredCapture.check_trigger(previous: int, sample: int)
+    Evaluates the trigger condition.
+
+    Parameters:
+    previous (int): The previous sample, None for the first one.
+    sample (int): The new sample.
+
+    Returns:
+    bool: True if the trigger fires.
+    """
+    def check_trigger(self, previous, sample):
+        if self.trigger == "ABOVE":
+            return sample >= self.level
+        if self.trigger == "BELOW":
+            return sample <= self.level
+        if previous is None:
+            return False
+        if self.trigger == "RISING":
+            return previous < self.level <= sample
+        return previous > self.level >= sample
+
+    """
+    TriggeredCapture.freeze()
+    Stops sampling and rotates the buffer in place so the window starts at index 0.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def freeze(self):
+        window = self.pre + self.post
+        start = (self.head - window) % self.size
+        # Rotate left by start with three in-place reversals, no allocation
+        self.reverse(0, start)
+        self.reverse(start, self.size)
+        self.reverse(0, self.size)
+        self.head = window % self.size
+        self.length = window
+        self.state = self.DONE
+        self.channels = None
+
+    """
+    TriggeredCapture.reverse(low: int, high: int)
+    Reverses buffer[low:high] in place.
+    """
+    def reverse(self, low, high):
+        buffer = self.buffer
+        high -= 1
+        while low < high:
+            buffer[low], buffer[high] = buffer[high], buffer[low]
+            low += 1
+            high -= 1
+
+    """
+    TriggeredCapture.get_status()
+    Describes the capture.
+
+    Parameters: VOID
+
+    Returns:
+    dict: state, name, trigger settings, samples taken so far and the window length once DONE.
+    """
+    def get_status(self):
+        if self.state is self.IDLE:
+            return {"state" : self.state}
+        return {
+            "state" : self.state,
+            "name" : self.name,
+            "trigger" : self.trigger,
+            "level" : self.level,
+            "pre" : self.pre,
+            "post" : self.post,
+            "rate" : self.rate,
+            "sampled" : self.count,
+            "trigger_value" : self.trigger_value,
+            "length" : self.length
+        }
+
+    """
+    TriggeredCapture.encode(offset: int = 0, count: int = None)
+    Encodes a range of the frozen window, see encode_samples(). Index pre is the trigger sample.
+
+    Parameters:
+    offset (int): Index of the first sample.
+    count (int, optional): Number of samples (default is None for the rest of the window).
+
+    Returns:
+    str: The base64 text, empty until the capture is DONE.
+    """
+    def encode(self, offset=0, count=None):
+        return encode_samples(self.buffer, self.length, offset, count)
+
+
+"""
+encode_rle(words: array, word_count: int, pin_count: int)
+Run-length encodes a packed logic trace. Each 32-bit word holds 32 // pin_count samples, the first sample in the
+highest bits, bit i of a sample is pin first + i. Whole words of a single repeated sample are skipped in one step.
+
+Parameters:
+words (array): array('L') holding the trace.
+word_count (int): Number of valid words.
+pin_count (int): Number of pins per sample.
+
+Returns:
+list: Flat [sample, run, sample, run, ...] list in time order.
+"""
+def encode_rle(words, word_count, pin_count):
+    per_word = 32 // pin_count
+    mask = (1 << pin_count) - 1
+    # uniform[v] is the word made of per_word copies of sample v
+    uniform = []
+    for value in range(1 << pin_count):
+        word = 0
+        for _ in range(per_word):
+            word = (word << pin_count) | value
+        uniform.append(word)
+
+    rle = []
+    current = None
+    run = 0
+    for index in range(word_count):
+        word = words[index]
+        if current is not None and word == uniform[current]:
+            run += per_word
+            continue
+        shift = pin_count * (per_word - 1)
+        while shift >= 0:
+            sample = (word >> shift) & mask
+            if sample == current:
+                run += 1
+            else:
+                if current is not None:
+                    rle.append(current)
+                    rle.append(run)
+                current = sample
+                run = 1
+            shift -= pin_count
+    if current is not None:
+        rle.append(current)
+        rle.append(run)
+    return rle
+
+
+"""
+decode_rle(rle: list)
+Expands a trace produced by encode_rle().
+
+Parameters:
+rle (list): Flat [sample, run, ...] list.
+
+Returns:
+list: One sample per entry.
+"""
+def decode_rle(rle):
+    samples = []
+    for index in range(0, len(rle), 2):
+        samples.extend([rle[index]] * rle[index + 1])
+    return samples
+
+
+class SimulatedStateMachine:
+
+    """
+    SimulatedStateMachine(program: array, frequency: int, first_in_pin: object, in_pin_count: int, push_threshold: int, **kwargs)
+    Stand-in for rp2pio.StateMachine on hosts without the module. readinto() packs a trace where pin i toggles
+    every 2 ** (i + 4) samples, in the layout the PIO program produces, so the capture and encoding path can run
+    on a desktop Python.
+
+    Returns: VOID
+    """
+    def __init__(self, program, frequency, first_in_pin, in_pin_count, push_threshold=32, **kwargs):
+        self.frequency = frequency
+        self.in_pin_count = in_pin_count
+        self.push_threshold = push_threshold
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deinit()
+
+    """
+    SimulatedStateMachine.readinto(buffer: array)
+    Fills buffer with packed samples.
+
+    Parameters:
+    buffer (array): array('L') to fill.
+
+    Returns: VOID
+    """
+    def readinto(self, buffer):
+        count = self.in_pin_count
+        per_word = self.push_threshold // count
+        sample_index = 0
+        for index in range(len(buffer)):
+            word = 0
+            for _ in range(per_word):
+                sample = 0
+                for pin in range(count):
+                    sample |= ((sample_index >> (pin + 4)) & 1) << pin
+                word = (word << count) | sample
+                sample_index += 1
+            buffer[index] = word
+
+    def deinit(self):
+        pass
+
+
+class LogicCapture:
+
+    """
+    LogicCapture(size: int = 1024, state_machine: type = None)
+    Logic analyzer capture of consecutive digital inputs with a PIO state machine running "in pins, n" once per
+    cycle, auto-pushing packed samples into a preallocated array('L'). Uses rp2pio.StateMachine when available,
+    SimulatedStateMachine otherwise.
+
+    Parameters:
+    size (int): Capture buffer in 32-bit words, allocated once.
+    state_machine (type, optional): Class used for the capture (default is None for rp2pio.StateMachine or SimulatedStateMachine).
+
+    Returns: VOID
+    """
+    def __init__(self, size=1024, state_machine=None):
+        self.size = size
+        self.buffer = array('L', (0 for _ in range(size)))
+        if state_machine is None:
+            state_machine = rp2pio.StateMachine if rp2pio is not None else SimulatedStateMachine
+        self.state_machine = state_machine
+        self.words = 0
+        self.pin_count = 0
+        self.rate = 0
+
+    """
+    LogicCapture.capture(first_pin: microcontroller.Pin, pin_count: int, rate: int, samples: int)
+    Samples pin_count consecutive pins starting at first_pin. The pins must not be held by a DigitalInOut during the capture.
+
+    Parameters:
+    first_pin (microcontroller.Pin): The first board pin.
+    pin_count (int): Number of pins, 1 to 8.
+    rate (int): Samples per second, MIN_LOGIC_RATE to MAX_LOGIC_RATE.
+    samples (int): Number of samples, rounded up to whole words.
+
+    Returns:
+    int: Number of samples captured.
+
+    Raises:
+    ValueError: If an argument is out of range.
+    """
+    def capture(self, first_pin, pin_count, rate, samples):
+        if pin_count < 1 or pin_count > 8:
+            raise ValueError("Pin count must be between 1 and 8.")
+        if rate < MIN_LOGIC_RATE or rate > MAX_LOGIC_RATE:
+            raise ValueError(f"Rate must be between {MIN_LOGIC_RATE} and {MAX_LOGIC_RATE}.")
+        per_word = 32 // pin_count
+        words = (samples + per_word - 1) // per_word
+        if words < 1 or words > self.size:
+            raise ValueError(f"Samples must be between 1 and {self.size * per_word}.")
+        # in pins, <pin_count>
+        program = array('H', [0x4000 | pin_count])
+        with self.state_machine(program, frequency=rate, first_in_pin=first_pin, in_pin_count=pin_count,
+                                auto_push=True, push_threshold=per_word * pin_count, in_shift_right=False) as machine:
+            machine.readinto(memoryview(self.buffer)[:words])
+        self.words = words
+        self.pin_count = pin_count
+        self.rate = rate
+        return words * per_word
+
+    """
+    LogicCapture.get_trace()
+    Encodes the last capture, see encode_rle().
+
+    Parameters: VOID
+
+    Returns:
+    dict: pins, rate, samples and the rle trace.
+    """
+    def get_trace(self):
+        samples = self.words * (32 // self.pin_count) if self.pin_count else 0
+        return {
+            "pins" : self.pin_count,
+            "rate" : self.rate,
+            "samples" : samples,
+            "rle" : encode_rle(self.buffer, self.words, self.pin_count) if self.pin_count else []
+        }
@@ -0,0 +1,86 @@
+class CommandRequest:
+
+    """
+    CommandRequest()
+    Holds the parsed content of a /cmd request body: the API key, the ordered list of commands and the parameters.
+    A $PARAM belongs to the $CMD before it; the ones before the first $CMD are shared by every command. params holds
+    every parameter of the request, shared the ones before the first $CMD, and each command carries its own dict.
+    get_param() reads the dict of the command being executed, see ApiServer.execute_commands(), or params outside of it.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def __init__(self):
+        self.api_key = None
+        self.commands = []
+        self.params = {}
+        self.shared = {}
+        self.scope = self.params
+
+    """
+    CommandRequest.get_param(key_name: str)
+    Retrieve a parameter value by key_name, from the parameters of the command being executed.
+
+    Parameters:
+    key_name (str): The key whose value is to be retrieved.
+
+    Returns:
+    str: The value of the parameter if found, or False if not found.
+    """
+    def get_param(self, key_name):
+        return self.scope.get(key_name, False)
+
+
+"""
+parse_request(raw_request: str)
+Tokenize a raw request in a single pass without splitting it: each "}" closes a token whose "{" is the last one
+before it, and the tag in front of that "{" is compared in place, so only the name, value and command text are
+sliced out. Stray braces and text around the tokens, e.g. a JSON wrapper, are skipped.
+Recognized tokens are $AUTH{API_KEY=key}, $CMD{NAME} or $CMD{NAME=VALUE} and $PARAM{KEY=VALUE}, anything else, tags
+without their "$" included, is skipped. A $PARAM is added to the parameters of the $CMD before it, or to the shared
+ones before the first $CMD, and to the request-wide params.
+
+Parameters:
+raw_request (str): The decoded request body.
+
+Returns:
+CommandRequest: The parsed request. Commands are (name, value, text, params) tuples in request order, value is None
+when absent, params is the shared dict when the command has no parameters of its own.
+"""
+def parse_request(raw_request):
+    parsed = CommandRequest()
+    commands = parsed.commands
+    shared = parsed.shared
+    scope = shared
+    find = raw_request.find
+    start = 0
+    end = find("}")
+    while end >= 0:
+        brace = raw_request.rfind("{", start, end)
+        if brace - 4 >= start:
+            if raw_request.startswith("$CMD", brace - 4):
+                text = raw_request[brace + 1:end]
+                split = text.find("=")
+                if split < 0:
+                    commands.append((text.strip(), None, text, shared))
+                else:
+                    commands.append((text[:split].strip(), text[split + 1:].strip(), text, shared))
+                scope = None
+            elif brace - 6 >= start and raw_request.startswith("$PARAM", brace - 6):
+                split = find("=", brace, end)
+                if split >= 0:
+                    key = raw_request[brace + 1:split].strip()
+                    value = raw_request[split + 1:end].strip()
+                    parsed.params[key] = value
+                    if scope is None:
+                        # First parameter of the last command, give it its own dict
+                        scope = dict(shared)
+                        name, command_value, text, _ = commands[-1]
+                        commands[-1] = (name, command_value, text, scope)
+                    scope[key] = value
+            elif brace - 5 >= start and parsed.api_key is None and raw_request.startswith("$AUTH{API_KEY=", brace - 5):
+                parsed.api_key = raw_request[brace + 9:end]
+        start = end + 1
+        end = find("}", start)
+    return parsed
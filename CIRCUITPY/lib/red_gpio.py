@@ -0,0 +1,385 @@
+import board
+import digitalio
+import analogio
+import countio
+
+# Layout used when settings.toml has no PICOW_PINS entry
+DEFAULT_PINS = "LED:OUT,GP21:OUT,GP20:OUT,GP19:OUT,GP18:IN,GP17:IN,GP16:IN,GP26_A0:AIN,GP27_A1:AIN,GP28_A2:AIN"
+
+"""
+counter_slice(board_pin: str)
+Finds the PWM slice a CNT pin counts with. On the RP2040 countio uses the PWM counter of the pin, which only counts
+on channel B, i.e. odd GPIO numbers, and each of the 8 slices has one counter.
+
+Parameters:
+board_pin (str): Name of the board pin, e.g. 'GP17'.
+
+Returns:
+int: The PWM slice, 0 to 7.
+
+Raises:
+ValueError: If the pin can not count.
+"""
+def counter_slice(board_pin):
+    digits = board_pin[2:].split("_")[0] if board_pin.startswith("GP") else ""
+    if not digits.isdigit() or int(digits) % 2 == 0:
+        raise ValueError("CNT needs an odd GPIO (PWM channel B), e.g. GP17: " + board_pin)
+    return int(digits) // 2 % 8
+
+"""
+parse_pin_spec(spec: str)
+Parses a pin layout string. Entries are separated by commas, each entry is [NAME=]BOARD_PIN:MODE[:PULL] where
+MODE is OUT, IN, AIN (analog input) or CNT (hardware rising edge counter) and PULL is UP, DOWN or NONE.
+NAME defaults to BOARD_PIN and is upper-cased, like every field, so lookups by name are case-insensitive. CNT pins must be odd GPIOs on different PWM slices, see counter_slice().
+EG. "LED:OUT,PUMP=GP21:OUT,GP18:IN:UP,FLOW=GP17:CNT:UP,GP26_A0:AIN"
+
+Parameters:
+spec (str): The layout string.
+
+Returns:
+list: (name, board_pin, mode, pull) tuples in spec order, pull is None when absent.
+
+Raises:
+ValueError: If an entry is malformed, a name is used twice or a CNT pin can not count.
+"""
+def parse_pin_spec(spec):
+    pins = []
+    names = set()
+    slices = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name = None
+        if "=" in entry:
+            name, entry = entry.split("=", 1)
+            name = name.strip().upper()
+        fields = [field.strip().upper() for field in entry.split(":")]
+        if len(fields) < 2 or len(fields) > 3:
+            raise ValueError("Invalid pin entry: " + entry)
+        board_pin = fields[0]
+        mode = fields[1]
+        pull = fields[2] if len(fields) == 3 and fields[2] != "NONE" else None
+        if mode not in ("OUT", "IN", "AIN", "CNT"):
+            raise ValueError("Invalid pin mode: " + mode)
+        if pull not in (None, "UP", "DOWN") or (pull and mode != "IN" and mode != "CNT"):
+            raise ValueError("Invalid pin pull: " + entry)
+        name = name or board_pin
+        if name in names:
+            raise ValueError("Duplicated pin name: " + name)
+        if mode == "CNT":
+            pwm_slice = counter_slice(board_pin)
+            if pwm_slice in slices:
+                raise ValueError("CNT pins " + slices[pwm_slice] + " and " + board_pin + " share PWM slice " + str(pwm_slice))
+            slices[pwm_slice] = board_pin
+        names.add(name)
+        pins.append((name, board_pin, mode, pull))
+    return pins
+
+
+class PinTable:
+
+    """
+    PinTable()
+    A compact registry of the configured pins. Each digital pin owns one bit, in the order the pins were added,
+    so the whole port can be read or written with an integer mask and value. Analog inputs are kept in their own list.
+    Edge counters are kept in a third list. Pins are looked up by name through a dict.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def __init__(self):
+        self.names = []
+        self.ios = []
+        self.pins = []
+        self.pulls = []
+        self.index = {}
+        self.output_mask = 0
+        self.analog_names = []
+        self.analog_ios = []
+        self.analog_pins = []
+        self.analog_index = {}
+        self.counter_names = []
+        self.counter_ios = []
+        self.counter_pins = []
+        self.counter_index = {}
+
+    """
+    PinTable.load_spec(spec: str)
+    Creates every pin of a layout string, see parse_pin_spec().
+
+    Parameters:
+    spec (str): The layout string, DEFAULT_PINS if None or empty.
+
+    Returns:
+    VOID
+
+    Raises:
+    ValueError: If the layout is invalid or names a pin the board does not have.
+    """
+    def load_spec(self, spec=None):
+        for name, board_pin, mode, pull in parse_pin_spec(spec or DEFAULT_PINS):
+            pin = getattr(board, board_pin, None)
+            if pin is None:
+                raise ValueError("Unknown board pin: " + board_pin)
+            if mode == "AIN":
+                self.add_analog(name, pin)
+            elif mode == "CNT":
+                self.add_counter(name, pin, pull)
+            else:
+                self.add_digital(name, pin, mode == "OUT", pull)
+
+    """
+    PinTable.create_digital(pin: microcontroller.Pin, output: bool, pull: str = None)
+    Creates and configures a DigitalInOut.
+
+    Parameters:
+    pin (microcontroller.Pin): The board pin.
+    output (bool): True for an output, False for an input.
+    pull (str, optional): 'UP' or 'DOWN' for an input with a pull resistor (default is None).
+
+    Returns:
+    digitalio.DigitalInOut: The pin.
+    """
+    def create_digital(self, pin, output, pull=None):
+        io = digitalio.DigitalInOut(pin)
+        io.direction = digitalio.Direction.OUTPUT if output else digitalio.Direction.INPUT
+        if pull == "UP":
+            io.pull = digitalio.Pull.UP
+        elif pull == "DOWN":
+            io.pull = digitalio.Pull.DOWN
+        return io
+
+    """
+    PinTable.add_digital(name: str, pin: microcontroller.Pin, output: bool, pull: str = None)
+    Creates the DigitalInOut for pin and appends it to the table.
+
+    Parameters:
+    name (str): Name of the pin, e.g. 'GP21'.
+    pin (microcontroller.Pin): The board pin, e.g. board.GP21.
+    output (bool): True for an output, False for an input.
+    pull (str, optional): 'UP' or 'DOWN' for an input with a pull resistor (default is None).
+
+    Returns:
+    int: The bit assigned to the pin.
+    """
+    def add_digital(self, name, pin, output, pull=None):
+        io = self.create_digital(pin, output, pull)
+        bit = len(self.ios)
+        self.names.append(name)
+        self.ios.append(io)
+        self.pins.append(pin)
+        self.pulls.append(pull)
+        self.index[name] = bit
+        if output:
+            self.output_mask |= 1 << bit
+        return bit
+
+    """
+    PinTable.add_analog(name: str, pin: microcontroller.Pin)
+    Creates the AnalogIn for pin and appends it to the table.
+
+    Parameters:
+    name (str): Name of the pin, e.g. 'GP26_A0'.
+    pin (microcontroller.Pin): The board pin, e.g. board.GP26_A0.
+
+    Returns:
+    int: The index of the channel.
+    """
+    def add_analog(self, name, pin):
+        channel = len(self.analog_ios)
+        self.analog_names.append(name)
+        self.analog_ios.append(analogio.AnalogIn(pin))
+        self.analog_pins.append(pin)
+        self.analog_index[name] = channel
+        return channel
+
+    """
+    PinTable.add_counter(name: str, pin: microcontroller.Pin, pull: str = None)
+    Creates a countio.Counter counting rising edges of pin in hardware and appends it to the table.
+
+    Parameters:
+    name (str): Name of the pin, e.g. 'GP17'.
+    pin (microcontroller.Pin): The board pin, e.g. board.GP17, an odd GPIO, see counter_slice().
+    pull (str, optional): 'UP' or 'DOWN' to enable a pull resistor (default is None).
+
+    Returns:
+    int: The index of the counter.
+    """
+    def add_counter(self, name, pin, pull=None):
+        if pull == "UP":
+            pull = digitalio.Pull.UP
+        elif pull == "DOWN":
+            pull = digitalio.Pull.DOWN
+        index = len(self.counter_ios)
+        self.counter_names.append(name)
+        self.counter_ios.append(countio.Counter(pin, edge=countio.Edge.RISE, pull=pull))
+        self.counter_pins.append(pin)
+        self.counter_index[name] = index
+        return index
+
+    """
+    PinTable.get(name: str)
+    Looks up a pin by name.
+
+    Parameters:
+    name (str): Name of the pin.
+
+    Returns:
+    digitalio.DigitalInOut: The pin, or None if it is not in the table.
+    """
+    def get(self, name):
+        bit = self.index.get(name)
+        return None if bit is None else self.ios[bit]
+
+    """
+    PinTable.get_analog(name: str)
+    Looks up an analog input by name.
+
+    Parameters:
+    name (str): Name of the pin.
+
+    Returns:
+    analogio.AnalogIn: The pin, or None if it is not in the table.
+    """
+    def get_analog(self, name):
+        channel = self.analog_index.get(name)
+        return None if channel is None else self.analog_ios[channel]
+
+    """
+    PinTable.get_mode(name: str)
+    Tells how a pin is configured.
+
+    Parameters:
+    name (str): Name of the pin.
+
+    Returns:
+    str: 'OUT', 'IN', 'AIN', 'CNT', or None if the pin is not in the table.
+    """
+    def get_mode(self, name):
+        bit = self.index.get(name)
+        if bit is not None:
+            return "OUT" if self.output_mask >> bit & 1 else "IN"
+        if name in self.analog_index:
+            return "AIN"
+        if name in self.counter_index:
+            return "CNT"
+        return None
+
+    """
+    PinTable.read_mask(mask: int = -1)
+    Reads the level of the pins in the table.
+
+    Parameters:
+    mask (int, optional): Bits of the pins to read, the others read as 0 (default is -1 for every pin).
+
+    Returns:
+    int: Bit n is set when pin n is high.
+    """
+    def read_mask(self, mask=-1):
+        value = 0
+        bit = 1
+        for io in self.ios:
+            if mask & bit and io.value:
+                value |= bit
+            bit <<= 1
+        return value
+
+    """
+    PinTable.stage_mask(mask: int, value: int)
+    Translates a masked port write into (pin, level) writes, without touching the pins.
+
+    Parameters:
+    mask (int): Bits of the pins to write.
+    value (int): Levels for the masked pins.
+
+    Returns:
+    list: (digitalio.DigitalInOut, bool) tuples.
+
+    Raises:
+    ValueError: If the mask selects an unknown pin or an input pin.
+    """
+    def stage_mask(self, mask, value):
+        if mask & ~self.output_mask:
+            raise ValueError("Mask selects pins that are not outputs: " + hex(mask & ~self.output_mask))
+        writes = []
+        bit = 1
+        for io in self.ios:
+            if mask & bit:
+                writes.append((io, bool(value & bit)))
+            bit <<= 1
+        return writes
+
+    """
+    PinTable.release_range(first: int, count: int)
+    Frees the consecutive board pins GP<first> to GP<first + count - 1>, e.g. for a PIO capture. Pins of the range
+    that are not in the table are left alone. Call restore_digital() with the returned bits when done.
+
+    Parameters:
+    first (int): GPIO number of the first pin.
+    count (int): Number of pins.
+
+    Returns:
+    tuple: (first board pin, list of released bits).
+
+    Raises:
+    ValueError: If a pin does not exist, or is in the table as an output or an analog input.
+    """
+    def release_range(self, first, count):
+        pins = []
+        for number in range(first, first + count):
+            pin = getattr(board, "GP" + str(number), None)
+            if pin is None:
+                raise ValueError(f"Unknown board pin: GP{number}")
+            if pin in self.analog_pins:
+                raise ValueError(f"GP{number} is an analog input.")
+            if pin in self.counter_pins:
+                raise ValueError(f"GP{number} is a counter.")
+            pins.append(pin)
+        bits = [bit for bit in range(len(self.pins)) if self.pins[bit] in pins]
+        for bit in bits:
+            if self.output_mask >> bit & 1:
+                raise ValueError(f"{self.names[bit]} is an output.")
+        for bit in bits:
+            self.ios[bit].deinit()
+        return pins[0], bits
+
+    """
+    PinTable.restore_digital(bits: list)
+    Re-creates the DigitalInOut of inputs freed by release_range(), in place.
+
+    Parameters:
+    bits (list): Bits of the pins.
+
+    Returns: VOID
+    """
+    def restore_digital(self, bits):
+        for bit in bits:
+            self.ios[bit] = self.create_digital(self.pins[bit], False, self.pulls[bit])
+
+    """
+    PinTable.release_analog(channel: int)
+    Frees the board pin of an analog input, e.g. for a buffered capture. Call restore_analog() when done.
+
+    Parameters:
+    channel (int): Index of the analog input.
+
+    Returns:
+    microcontroller.Pin: The board pin.
+    """
+    def release_analog(self, channel):
+        self.analog_ios[channel].deinit()
+        return self.analog_pins[channel]
+
+    """
+    PinTable.restore_analog(channel: int)
+    Re-creates the AnalogIn of an input freed by release_analog(), in place.
+
+    Parameters:
+    channel (int): Index of the analog input.
+
+    Returns: VOID
+    """
+    def restore_analog(self, channel):
+        self.analog_ios[channel] = analogio.AnalogIn(self.analog_pins[channel])
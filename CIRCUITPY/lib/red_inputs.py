@@ -0,0 +1,235 @@
+import time
+from array import array
+
+
+class InputEventQueue:
+
+    """
+    InputEventQueue(names: list, read_mask: function, watch_mask: int, size: int = 64, interval: float = 0.005)
+    Detects level changes of digital inputs from the main loop and keeps timestamped rise and fall events in a
+    bounded ring of preallocated arrays. Events carry a sequence number so clients read them with a cursor; when the
+    ring is full the oldest events are overwritten. A main loop that sleeps wakes up at least every interval seconds
+    to read the inputs, see next_due(); pulses shorter than that may be missed.
+
+    Parameters:
+    names (list): Pin name of each bit.
+    read_mask (function): read_mask(mask) returns the levels of the masked pins as a bitmask, e.g. PinTable.read_mask.
+    watch_mask (int): Bits of the pins to watch.
+    size (int): Number of events kept.
+    interval (float): Longest time between two reads of the inputs when the main loop sleeps.
+
+    Returns: VOID
+    """
+    def __init__(self, names, read_mask, watch_mask, size=64, interval=0.005):
+        self.names = names
+        self.read_mask = read_mask
+        self.watch_mask = watch_mask
+        self.size = size
+        self.times = array('L', (0 for _ in range(size)))
+        self.bits = array('B', (0 for _ in range(size)))
+        self.edges = array('B', (0 for _ in range(size)))
+        self.seq = 0
+        self.last = read_mask(watch_mask) if watch_mask else 0
+        self.interval_ns = int(interval * 1000000000)
+        self.next_ns = time.monotonic_ns()
+
+    """
+    InputEventQueue.poll()
+    Reads the watched inputs once and queues an event for every pin that changed since the previous poll.
+    Meant to be called on every main loop iteration.
+
+    Parameters: VOID
+
+    Returns:
+    int: Number of events queued.
+    """
+    def poll(self):
+        if not self.watch_mask:
+            return 0
+        now = time.monotonic_ns()
+        self.next_ns = now + self.interval_ns
+        level = self.read_mask(self.watch_mask)
+        changed = level ^ self.last
+        if not changed:
+            return 0
+        self.last = level
+        now = now // 1000000 & 0xFFFFFFFF
+        queued = 0
+        bit = 0
+        while changed:
+            if changed & 1:
+                slot = self.seq % self.size
+                self.times[slot] = now
+                self.bits[slot] = bit
+                self.edges[slot] = level >> bit & 1
+                self.seq += 1
+                queued += 1
+            changed >>= 1
+            bit += 1
+        return queued
+
+    """
+    InputEventQueue.next_due()
+    Tells when the inputs should be read next, so the main loop can sleep until then.
+
+    Parameters: VOID
+
+    Returns:
+    int: time.monotonic_ns() of the next read, or None if no input is watched.
+    """
+    def next_due(self):
+        return self.next_ns if self.watch_mask else None
+
+    """
+    InputEventQueue.read(cursor: int = 0, limit: int = 50)
+    Reads the events from cursor on, oldest first, without removing them. A cursor past the newest event, e.g. kept by
+    a client across a reset, restarts from the oldest event kept.
+
+    Parameters:
+    cursor (int): Sequence number of the first event wanted, usually the cursor returned by the previous read.
+    limit (int): Maximum number of events to return.
+
+    Returns:
+    dict: events (seq, pin, edge RISE or FALL, ms since boot), cursor for the next read and the number of
+    events dropped because they were overwritten before being read.
+    """
+    def read(self, cursor=0, limit=50):
+        oldest = max(0, self.seq - self.size)
+        dropped = 0
+        if cursor > self.seq:
+            cursor = oldest
+        if cursor < oldest:
+            dropped = oldest - cursor
+            cursor = oldest
+        end = min(self.seq, cursor + limit)
+        events = []
+        for seq in range(cursor, end):
+            slot = seq % self.size
+            events.append({
+                "seq" : seq,
+                "pin" : self.names[self.bits[slot]],
+                "edge" : "RISE" if self.edges[slot] else "FALL",
+                "ms" : self.times[slot]
+            })
+        return {"events" : events, "cursor" : max(cursor, end), "dropped" : dropped}
+
+
+class PulseCounters:
+
+    """
+    PulseCounters(names: list, counters: list, interval: float = 0.25, slots: int = 16)
+    Frequency measurement on top of hardware edge counters. poll() snapshots every counter at a fixed interval into
+    preallocated rings, so a frequency over a sliding window costs one subtraction, and counting itself needs no
+    Python work per edge.
+
+    Parameters:
+    names (list): Name of each counter.
+    counters (list): Objects with a .count property and a reset() method, e.g. countio.Counter.
+    interval (float): Seconds between snapshots.
+    slots (int): Snapshots kept, the longest window is interval * (slots - 1).
+
+    Returns: VOID
+    """
+    def __init__(self, names, counters, interval=0.25, slots=16):
+        self.names = names
+        self.counters = counters
+        self.interval_ns = int(interval * 1000000000)
+        self.slots = slots
+        self.times = array('L', (0 for _ in range(slots)))
+        self.counts = [array('L', (0 for _ in range(slots))) for _ in counters]
+        self.first_seq = [0 for _ in counters]
+        self.seq = 0
+        self.next_ns = time.monotonic_ns()
+
+    """
+    PulseCounters.poll()
+    Snapshots every counter if the next snapshot is due. Meant to be called on every main loop iteration.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def poll(self):
+        if not self.counters:
+            return
+        now = time.monotonic_ns()
+        if now < self.next_ns:
+            return
+        self.next_ns += self.interval_ns
+        if self.next_ns < now:
+            self.next_ns = now + self.interval_ns
+        slot = self.seq % self.slots
+        self.times[slot] = now // 1000000 & 0xFFFFFFFF
+        for counter, counts in zip(self.counters, self.counts):
+            counts[slot] = counter.count & 0xFFFFFFFF
+        self.seq += 1
+
+    """
+    PulseCounters.next_due()
+    Tells when poll() has work next, so the main loop can sleep until then.
+
+    Parameters: VOID
+
+    Returns:
+    int: time.monotonic_ns() of the next snapshot, or None if there is no counter.
+    """
+    def next_due(self):
+        return self.next_ns if self.counters else None
+
+    """
+    PulseCounters.get_counts()
+    Reads every counter.
+
+    Parameters: VOID
+
+    Returns:
+    dict: Count of each counter by name.
+    """
+    def get_counts(self):
+        return {name : counter.count for name, counter in zip(self.names, self.counters)}
+
+    """
+    PulseCounters.reset(index: int = None)
+    Resets a counter, or every counter, and restarts its frequency window.
+
+    Parameters:
+    index (int, optional): Index of the counter (default is None for every counter).
+
+    Returns: VOID
+    """
+    def reset(self, index=None):
+        for i in range(len(self.counters)) if index is None else (index,):
+            self.counters[i].reset()
+            self.first_seq[i] = self.seq
+
+    """
+    PulseCounters.get_frequency(index: int, window: float)
+    Computes the edge rate of a counter between now and the newest snapshot at least window seconds old, or the oldest
+    snapshot available.
+
+    Parameters:
+    index (int): Index of the counter.
+    window (float): Window in seconds.
+
+    Returns:
+    dict: hz and the window actually used in seconds, hz is None before the first snapshot.
+    """
+    def get_frequency(self, index, window):
+        now = time.monotonic_ns() // 1000000 & 0xFFFFFFFF
+        count = self.counters[index].count & 0xFFFFFFFF
+        window_ms = int(window * 1000)
+        oldest = max(self.first_seq[index], self.seq - self.slots)
+        seq = self.seq - 1
+        chosen = None
+        while seq >= oldest:
+            chosen = seq % self.slots
+            if (now - self.times[chosen]) & 0xFFFFFFFF >= window_ms:
+                break
+            seq -= 1
+        if chosen is None:
+            return {"hz" : None, "window" : 0}
+        elapsed = (now - self.times[chosen]) & 0xFFFFFFFF
+        if elapsed == 0:
+            return {"hz" : None, "window" : 0}
+        edges = (count - self.counts[index][chosen]) & 0xFFFFFFFF
+        return {"hz" : edges * 1000 / elapsed, "window" : elapsed / 1000}
@@ -0,0 +1,1283 @@
+import os
+import json
+import time
+import struct
+from array import array
+
+try:
+    import storage
+except ImportError:
+    # Host Python, e.g. the benchmarks under /bench
+    storage = None
+
+try:
+    from calendar import timegm
+except ImportError:
+    # CircuitPython: the RTC holds the board time without a timezone, mktime() does not shift it
+    timegm = time.mktime
+# CircuitPython only has localtime(), which is timezone free like gmtime() on the host
+gmtime = getattr(time, 'gmtime', time.localtime)
+
+# Bytes read per step when scanning the log backwards
+READ_BLOCK = 512
+
+"""
+reverse_lines(log_file: file, block_size: int = READ_BLOCK)
+Yields the lines of a file opened in binary mode from the last to the first. The file is read backwards in blocks of
+block_size bytes from its end, so reading the newest lines costs the same whatever the file size.
+
+Parameters:
+log_file (file): The file, opened with 'rb'.
+block_size (int, optional): Bytes read per step (default is READ_BLOCK).
+
+Returns:
+generator: Non-empty lines as bytes, without the line break.
+"""
+def reverse_lines(log_file, block_size=READ_BLOCK):
+    position = log_file.seek(0, 2)
+    tail = b''
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        log_file.seek(position)
+        block = log_file.read(size) + tail
+        end = len(block)
+        newline = block.rfind(b'\n', 0, end)
+        while newline >= 0:
+            if end - newline > 1:
+                yield block[newline + 1:end]
+            end = newline
+            newline = block.rfind(b'\n', 0, end)
+        # The first line of the block may continue in the previous block
+        tail = block[:end]
+    if tail:
+        yield tail
+
+
+"""
+format_time(epoch: int)
+Formats a timestamp the way log entries store it. The epoch is taken as is, without any timezone, so a log gives
+the same times on the board and on a host whatever its TZ.
+
+Parameters:
+epoch (int): Seconds since the epoch, e.g. time.time().
+
+Returns:
+str: 'YYYY-MM-DD HH:MM:SS' in board time.
+"""
+def format_time(epoch):
+    current_time = gmtime(epoch)
+    return "{:04}-{:02}-{:02} {:02}:{:02}:{:02}".format(
+        current_time[0], current_time[1], current_time[2],
+        current_time[3], current_time[4], current_time[5]
+    )
+
+
+class CodeTable:
+
+    """
+    CodeTable(names: tuple)
+    Maps level or group names to small integer codes. Predefined names keep their codes, which are also the codes
+    stored in binary log records; other names get the next free code while codes fit in a byte.
+
+    Parameters:
+    names (tuple): The predefined names, in code order.
+
+    Returns: VOID
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        self.fixed = len(self.names)
+        self.codes = {}
+        for code, name in enumerate(self.names):
+            self.codes[name] = code
+
+    """
+    CodeTable.code(name: str)
+    Looks up the code of a name, assigning one if needed.
+
+    Parameters:
+    name (str): The name.
+
+    Returns:
+    int: The code, 255 once the table is full.
+    """
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            if len(self.names) >= 255:
+                return 255
+            code = len(self.names)
+            self.names.append(name)
+            self.codes[name] = code
+        return code
+
+    """
+    CodeTable.name(code: int)
+    Looks up the name of a code.
+
+    Parameters:
+    code (int): The code.
+
+    Returns:
+    str: The name, '?' for an unknown code.
+    """
+    def name(self, code):
+        return self.names[code] if code < len(self.names) else '?'
+
+
+LEVELS = CodeTable(('DEBUG', 'INFO', 'WARN', 'ERROR'))
+GROUPS = CodeTable(('SYS',))
+
+# Binary record: epoch (u32), level code (u8), group code (u8), body length (u16), body, record length (u16).
+# The body is the message in UTF-8, preceded by the level and/or group name (u8 length + UTF-8) when their code is
+# NAMED. The trailing length lets the file be read backwards.
+RECORD_HEADER = '<IBBH'
+HEADER_SIZE = 8
+NAMED = 255
+MAX_BODY = 65000
+
+"""
+parse_time(text: str)
+Inverse of format_time().
+
+Parameters:
+text (str): 'YYYY-MM-DD HH:MM:SS' in board time.
+
+Returns:
+int: Seconds since the epoch.
+"""
+def parse_time(text):
+    return int(timegm((int(text[0:4]), int(text[5:7]), int(text[8:10]), int(text[11:13]), int(text[14:16]), int(text[17:19]), 0, -1, -1)))
+
+
+"""
+encode_record(epoch: int, level: str, group: str, message: str)
+Packs a log entry into a binary record.
+
+Parameters:
+epoch (int): Seconds since the epoch.
+level (str): Severity level.
+group (str): Group identifier.
+message (str): The message, cut to MAX_BODY bytes.
+
+Returns:
+bytes: The record, trailing length included.
+"""
+def encode_record(epoch, level, group, message):
+    body = str(message).encode()
+    level_code = LEVELS.codes.get(level, NAMED)
+    group_code = GROUPS.codes.get(group, NAMED)
+    if group_code >= GROUPS.fixed:
+        name = group.encode()[:255]
+        group_code = NAMED
+        body = bytes((len(name),)) + name + body
+    if level_code >= LEVELS.fixed:
+        name = level.encode()[:255]
+        level_code = NAMED
+        body = bytes((len(name),)) + name + body
+    body = body[:MAX_BODY]
+    return struct.pack(RECORD_HEADER, epoch, level_code, group_code, len(body)) + body + struct.pack('<H', HEADER_SIZE + len(body))
+
+
+"""
+decode_record(record: bytes)
+Unpacks a binary record into a log entry.
+
+Parameters:
+record (bytes): The record, without the trailing length.
+
+Returns:
+dict: level, group, sysdt and message, as in the JSON format.
+"""
+def decode_record(record):
+    epoch, level_code, group_code, length = struct.unpack_from(RECORD_HEADER, record)
+    position = HEADER_SIZE
+    if level_code == NAMED:
+        size = record[position]
+        level = record[position + 1:position + 1 + size].decode()
+        position += 1 + size
+    else:
+        level = LEVELS.name(level_code)
+    if group_code == NAMED:
+        size = record[position]
+        group = record[position + 1:position + 1 + size].decode()
+        position += 1 + size
+    else:
+        group = GROUPS.name(group_code)
+    return {
+        'level': level,
+        'group': group,
+        'sysdt': format_time(epoch),
+        'message': record[position:HEADER_SIZE + length].decode()
+    }
+
+
+"""
+read_records(log_file: file)
+Yields the binary records of a file from the first to the last.
+
+Parameters:
+log_file (file): The file, opened with 'rb'.
+
+Returns:
+generator: Records as bytes, without the trailing length.
+"""
+def read_records(log_file):
+    while True:
+        header = log_file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return
+        length = header[6] | header[7] << 8
+        rest = log_file.read(length + 2)
+        if len(rest) < length + 2:
+            return
+        yield header + rest[:length]
+
+
+"""
+reverse_records(log_file: file, block_size: int = READ_BLOCK)
+Yields the binary records of a file from the last to the first, reading it backwards in blocks like reverse_lines().
+Stops at the first record whose lengths do not agree, e.g. cut by a power loss.
+
+Parameters:
+log_file (file): The file, opened with 'rb'.
+block_size (int, optional): Bytes read per step (default is READ_BLOCK).
+
+Returns:
+generator: Records as bytes, without the trailing length.
+"""
+def reverse_records(log_file, block_size=READ_BLOCK):
+    position = log_file.seek(0, 2)
+    block = b''
+    end = 0
+    while True:
+        while end >= 2:
+            size = block[end - 2] | block[end - 1] << 8
+            start = end - 2 - size
+            if start < 0:
+                break
+            if size < HEADER_SIZE or (block[start + 6] | block[start + 7] << 8) + HEADER_SIZE != size:
+                return
+            yield block[start:end - 2]
+            end = start
+        if position <= 0:
+            return
+        size = min(block_size, position)
+        position -= size
+        log_file.seek(position)
+        block = log_file.read(size) + block[:end]
+        end = len(block)
+
+
+"""
+convert_log(source: str, target: str, binary: bool = True)
+Converts a log file between the JSON lines format and the binary record format. Lines or records that can not be
+read are skipped.
+
+Parameters:
+source (str): Path of the log to read.
+target (str): Path of the log to write, overwritten.
+binary (bool, optional): True converts JSON to binary, False binary to JSON (default is True).
+
+Returns:
+int: Number of entries converted.
+"""
+def convert_log(source, target, binary=True):
+    count = 0
+    if binary:
+        with open(source, 'r') as source_file, open(target, 'wb') as target_file:
+            for line in source_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                target_file.write(encode_record(parse_time(entry['sysdt']), entry['level'], entry['group'], entry['message']))
+                count += 1
+    else:
+        with open(source, 'rb') as source_file, open(target, 'w') as target_file:
+            for record in read_records(source_file):
+                target_file.write(json.dumps(decode_record(record)) + '\n')
+                count += 1
+    return count
+
+
+# Most (level, group, template) keys tracked by the rate limiter at once
+MAX_RATE_KEYS = 32
+
+# Sidecar index entry: byte offset of the entry in its log file (u32), level code (u8), group code (u8)
+INDEX_ENTRY = '<IBB'
+INDEX_SIZE = 6
+
+"""
+entry_codes(level: str, group: str)
+Codes of an entry as stored in binary records and index entries: the fixed LEVELS/GROUPS code, or NAMED.
+
+Parameters:
+level (str): Severity level, or None.
+group (str): Group identifier, or None.
+
+Returns:
+tuple: (level code, group code), None for a None name.
+"""
+def entry_codes(level, group):
+    level_code = None if level is None else LEVELS.codes.get(level, NAMED)
+    group_code = None if group is None else GROUPS.codes.get(group, NAMED)
+    if level_code is not None and level_code >= LEVELS.fixed:
+        level_code = NAMED
+    if group_code is not None and group_code >= GROUPS.fixed:
+        group_code = NAMED
+    return level_code, group_code
+
+
+"""
+entry_matches(log_entry: dict, level: str, group: str, since_text: str, until_text: str)
+Checks a decoded entry against query filters. Formatted times sort like the times they format.
+
+Parameters:
+log_entry (dict): The entry.
+level (str): Severity level, or None for any.
+group (str): Group identifier, or None for any.
+since_text (str): Oldest formatted time, or None.
+until_text (str): Newest formatted time, or None.
+
+Returns:
+bool: True if the entry passes every filter.
+"""
+def entry_matches(log_entry, level, group, since_text, until_text):
+    return (level is None or log_entry['level'] == level) and (group is None or log_entry['group'] == group) and (since_text is None or log_entry['sysdt'] >= since_text) and (until_text is None or log_entry['sysdt'] <= until_text)
+
+
+"""
+reverse_index(index_file: file, level_code: int = None, group_code: int = None, block_size: int = READ_BLOCK)
+Yields the log offsets of a sidecar index from the last to the first, keeping those whose codes match. Reads the
+index backwards in blocks and compares the code bytes in place, so skipped entries allocate nothing.
+
+Parameters:
+index_file (file): The index, opened with 'rb'.
+level_code (int, optional): Level code to keep, None for any (default is None).
+group_code (int, optional): Group code to keep, None for any (default is None).
+block_size (int, optional): Bytes read per step, rounded down to whole entries (default is READ_BLOCK).
+
+Returns:
+generator: Byte offsets in the log file.
+"""
+def reverse_index(index_file, level_code=None, group_code=None, block_size=READ_BLOCK):
+    block_size -= block_size % INDEX_SIZE
+    position = index_file.seek(0, 2)
+    position -= position % INDEX_SIZE
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        index_file.seek(position)
+        block = index_file.read(size)
+        for i in range(size - INDEX_SIZE, -1, -INDEX_SIZE):
+            if (level_code is None or block[i + 4] == level_code) and (group_code is None or block[i + 5] == group_code):
+                yield block[i] | block[i + 1] << 8 | block[i + 2] << 16 | block[i + 3] << 24
+
+
+class LogRing:
+
+    """
+    LogRing(size: int)
+    Keeps the most recent log entries in preallocated slots: epoch seconds in array('L'), level and group codes in
+    array('B') (see LEVELS and GROUPS), and a reference to the message string.
+
+    Parameters:
+    size (int): Number of entries kept.
+
+    Returns: VOID
+    """
+    def __init__(self, size):
+        self.size = size
+        self.times = array('L', (0 for _ in range(size)))
+        self.levels = array('B', (0 for _ in range(size)))
+        self.groups = array('B', (0 for _ in range(size)))
+        self.messages = [None] * size
+        self.head = 0
+        self.count = 0
+        self.total = 0
+
+    """
+    LogRing.clear()
+    Drops every entry.
+
+    Parameters: VOID
+    Returns: VOID
+    """
+    def clear(self):
+        for slot in range(self.size):
+            self.messages[slot] = None
+        self.head = 0
+        self.count = 0
+
+    """
+    LogRing.push(epoch: int, level: str, group: str, message: str)
+    Stores an entry, overwriting the oldest one when full.
+
+    Parameters:
+    epoch (int): Seconds since the epoch.
+    level (str): Severity level.
+    group (str): Group identifier.
+    message (str): The message.
+
+    Returns: VOID
+    """
+    def push(self, epoch, level, group, message):
+        head = self.head
+        self.times[head] = epoch
+        self.levels[head] = LEVELS.code(level)
+        self.groups[head] = GROUPS.code(group)
+        self.messages[head] = message
+        self.head = (head + 1) % self.size
+        self.total += 1
+        if self.count < self.size:
+            self.count += 1
+
+    """
+    LogRing.read(limit: int = 5, level: str = None, group: str = None)
+    Reads entries newest first, in the format of Logger.read().
+
+    Parameters:
+    limit (int): The maximum number of log entries to return.
+    level (str): Filter logs by severity level.
+    group (str): Filter logs by group identifier.
+
+    Returns:
+    list: A list of log entries, possibly empty.
+    """
+    def read(self, limit=5, level=None, group=None):
+        return self.query(limit, level, group)[0]
+
+    """
+    LogRing.query(limit: int = 15, level: str = None, group: str = None, since: int = None, until: int = None, after: int = None)
+    Reads entries by number, every pushed entry getting the next one. Without after the newest matching entries are
+    returned, otherwise the oldest matching entries numbered after or more.
+
+    Parameters:
+    limit (int): The maximum number of log entries to return.
+    level (str): Filter logs by severity level.
+    group (str): Filter logs by group identifier.
+    since (int): Only entries at or after this epoch.
+    until (int): Only entries at or before this epoch.
+    after (int): Number of the first entry to consider, e.g. a previous next number.
+
+    Returns:
+    tuple: (entries newest first, number to pass as after to get the following entries).
+    """
+    def query(self, limit=15, level=None, group=None, since=None, until=None, after=None):
+        entries = []
+        level_code = None if level is None else LEVELS.codes.get(level, -1)
+        group_code = None if group is None else GROUPS.codes.get(group, -1)
+        first = self.total - self.count
+        if after is None:
+            numbers = range(self.total - 1, first - 1, -1)
+        else:
+            numbers = range(max(after, first), self.total)
+        next_number = self.total if after is None else max(after, first)
+        for number in numbers:
+            if len(entries) >= limit:
+                break
+            next_number = number + 1
+            slot = (self.head - self.total + number) % self.size
+            epoch = self.times[slot]
+            if since is not None and epoch < since:
+                if after is None:
+                    break
+                continue
+            if (until is not None and epoch > until) or (level_code is not None and self.levels[slot] != level_code) or (group_code is not None and self.groups[slot] != group_code):
+                continue
+            entries.append({
+                'level': LEVELS.name(self.levels[slot]),
+                'group': GROUPS.name(self.groups[slot]),
+                'sysdt': format_time(epoch),
+                'message': self.messages[slot]
+            })
+        if after is None:
+            return entries, self.total
+        entries.reverse()
+        return entries, next_number
+
+
+class Logger:
+
+    """
+    Logger(filename: str = 'syslog.txt', print_log: bool = True, buffer_size: int = 0, flush_interval: float = 5.0, max_size: int = 0, segments: int = 3, ram_size: int = 32, binary: bool = False, indexed: bool = True, rate_window: float = 0, rate_burst: int = 5, console_level: str = 'DEBUG', file_level: str = 'DEBUG', ram_level: str = 'DEBUG')
+    Initializes the logger system which manages application logs.
+    With buffer_size > 0 entries are queued in RAM and appended to the file in batches: when the queue is full,
+    when an ERROR entry is added, on Logger.flush(), or on Logger.poll() once the oldest entry has waited
+    flush_interval seconds. Call Logger.poll() when the main loop is idle so the flash write stays out of requests.
+    With max_size > 0 the log is rotated: once filename would grow past max_size bytes it is renamed to
+    filename.1, the older segments shift to filename.2 ... filename.<segments> and the oldest one is deleted.
+    The newest ram_size entries are also kept in a LogRing. It is the whole log when the storage is read-only, and
+    answers reads without touching the file when it holds enough matching entries.
+    With binary=True the file holds packed records (see encode_record()) instead of JSON lines; Logger.read() returns
+    the same dicts either way. Use convert_log() to switch an existing file.
+    With indexed=True every log file has a sidecar index, <file>.idx, holding the offset, level code and group code
+    of each entry (6 bytes, see INDEX_ENTRY). Reads filtered by level or group walk the index and only read the
+    matching entries. An index that is missing or does not match its log is rebuilt from the log: the log file's at
+    startup, a rotated segment's on the first filtered read that needs it, see Logger.repair_index().
+    Logger.query() pages through the log with time filters and an opaque cursor, so clients only fetch new entries.
+    With rate_window > 0 each (level, group, template) key may add rate_burst entries per rate_window seconds; the
+    repeats after that are dropped before any formatting or I/O and counted, and one "(repeated N times)" entry,
+    built from the last dropped message, is added when the window ends, so an error flood costs a bounded number of
+    writes.
+    Each sink (console, log file, RAM ring) has a minimum level, in LEVELS order; levels that are not in LEVELS rank
+    above ERROR. An entry no sink accepts is dropped first thing in Logger.add(), before the rate limiter, the clock
+    and the message arguments are touched.
+
+    Parameters:
+    filename (str): Filename for the log file.
+    print_log (bool): Flag to enable logging to console.
+    buffer_size (int, optional): Maximum number of queued entries, 0 writes every entry immediately (default is 0).
+    flush_interval (float, optional): Maximum seconds an entry stays queued when polled (default is 5.0).
+    max_size (int, optional): Size in bytes at which the log file is rotated, 0 never rotates (default is 0).
+    segments (int, optional): Number of rotated segments kept besides the log file (default is 3).
+    ram_size (int, optional): Number of entries kept in RAM, 0 disables the ring (default is 32).
+    binary (bool, optional): Write binary records instead of JSON lines (default is False).
+    indexed (bool, optional): Maintain the sidecar indexes (default is True).
+    rate_window (float, optional): Rate limiting window in seconds, 0 disables rate limiting (default is 0).
+    rate_burst (int, optional): Entries allowed per key and window (default is 5).
+    console_level (str, optional): Minimum level printed to the console (default is 'DEBUG').
+    file_level (str, optional): Minimum level written to the log file (default is 'DEBUG').
+    ram_level (str, optional): Minimum level kept in the RAM ring (default is 'DEBUG').
+
+    Returns: VOID
+    """
+    def __init__(self, filename='syslog.txt', print_log=True, buffer_size=0, flush_interval=5.0, max_size=0, segments=3, ram_size=32, binary=False, indexed=True, rate_window=0, rate_burst=5, console_level='DEBUG', file_level='DEBUG', ram_level='DEBUG'):
+        self.filename = filename
+        self.print_log = print_log
+        self.buffer_size = buffer_size
+        self.flush_interval = int(flush_interval * 1000000000)
+        self.max_size = max_size
+        self.segments = segments
+        self.binary = binary
+        self.indexed = indexed
+        # Cursors name a log file by its number, bumped on every rotation, and are only valid for this boot
+        self.sequence = 0
+        self.boot = "".join("{:02x}".format(b) for b in os.urandom(2))
+        self.size = 0
+        self.pending = []
+        self.pending_codes = []
+        self.pending_since = 0
+        self.ram = LogRing(ram_size) if ram_size > 0 else None
+        self.rate_window = int(rate_window * 1000000000)
+        self.rate_burst = rate_burst
+        # (level, group, template) -> [window start, entries in the window, entries dropped]
+        self.rate_limits = {}
+        self.next_sweep = 0
+        self.readonly = storage.getmount('/').readonly if storage else False
+        # Level codes of the sink thresholds, a disabled sink accepts nothing
+        self.console_level = LEVELS.code(console_level) if print_log or self.readonly else 256
+        self.file_level = 256 if self.readonly else LEVELS.code(file_level)
+        self.ram_level = 256 if self.ram is None else LEVELS.code(ram_level)
+        self.min_level = min(self.console_level, self.file_level, self.ram_level)
+        # Check if the log file exists, if not, create one
+        if not self.readonly:
+            try:
+                self.size = os.stat(self.filename)[6]
+            except OSError:
+                with open(self.filename, 'w') as log_file:
+                    log_file.write("")
+            if self.indexed:
+                self.repair_index(0)
+
+    """
+    Logger.get_readonly()
+    Checks if the storage is in read-only mode.
+
+    Parameters: VOID
+    Returns:
+    bool: True if the storage read-only, False otherwise.
+    """
+    def get_readonly(self):
+        return self.readonly
+
+    """
+    Logger.clear()
+    Clears the log file, rotated segments, queued entries and the RAM ring included. The new log file gets the next
+    number, so cursors into the cleared log restart from the oldest entry instead of pointing into new lines.
+
+    Parameters: VOID
+    Returns:
+    bool: True if the operation was successful, False otherwise.
+    """
+    def clear(self):
+        # Remove all content of the log file
+        self.pending = []
+        self.pending_codes = []
+        if self.ram is not None:
+            self.ram.clear()
+            if self.readonly:
+                return True
+        if not self.readonly:
+            for index in range(1, self.segments + 1):
+                for name in (self.segment_name(index), self.index_name(index)):
+                    try:
+                        os.remove(name)
+                    except OSError:
+                        pass
+            with open(self.filename, 'w') as log_file:
+                log_file.write("")
+            if self.indexed:
+                with open(self.index_name(0), 'w') as index_file:
+                    index_file.write("")
+            self.size = 0
+            self.sequence += 1
+            return True
+        return False
+
+    """
+    Logger.segment_name(index: int)
+    Names a segment of the log.
+
+    Parameters:
+    index (int): 0 for the log file being written, 1 for the newest rotated segment and so on.
+
+    Returns:
+    str: The filename of the segment.
+    """
+    def segment_name(self, index):
+        return self.filename if index == 0 else self.filename + "." + str(index)
+
+    """
+    Logger.index_name(index: int)
+    Names the sidecar index of a segment.
+
+    Parameters:
+    index (int): Index of the segment, see Logger.segment_name().
+
+    Returns:
+    str: The filename of the index.
+    """
+    def index_name(self, index):
+        return self.segment_name(index) + ".idx"
+
+    """
+    Logger.check_index(index: int)
+    Tells whether the sidecar index of a segment matches it: whole entries only, and the last entry starts the last
+    line or record of the log.
+
+    Parameters:
+    index (int): Index of the segment.
+
+    Returns:
+    bool: True if the index can be used.
+    """
+    def check_index(self, index):
+        try:
+            log_size = os.stat(self.segment_name(index))[6]
+        except OSError:
+            log_size = 0
+        try:
+            index_size = os.stat(self.index_name(index))[6]
+        except OSError:
+            return log_size == 0
+        if index_size % INDEX_SIZE:
+            return False
+        if index_size == 0 or log_size == 0:
+            return index_size == log_size
+        try:
+            with open(self.index_name(index), 'rb') as index_file:
+                index_file.seek(index_size - INDEX_SIZE)
+                offset = struct.unpack_from(INDEX_ENTRY, index_file.read(INDEX_SIZE))[0]
+            with open(self.segment_name(index), 'rb') as log_file:
+                log_file.seek(offset)
+                if self.binary:
+                    header = log_file.read(HEADER_SIZE)
+                    return len(header) == HEADER_SIZE and offset + HEADER_SIZE + (header[6] | header[7] << 8) + 2 == log_size
+                line = log_file.readline()
+                return offset + len(line) == log_size and line[-1:] == b'\n'
+        except OSError:
+            return False
+
+    """
+    Logger.rebuild_index(index: int)
+    Rewrites the sidecar index of a segment from the log. The new index is written aside and renamed over the old one.
+
+    Parameters:
+    index (int): Index of the segment.
+
+    Returns:
+    int: Number of entries indexed.
+    """
+    def rebuild_index(self, index):
+        count = 0
+        offset = 0
+        temp_name = self.index_name(index) + ".tmp"
+        try:
+            with open(self.segment_name(index), 'rb') as log_file, open(temp_name, 'wb') as index_file:
+                if self.binary:
+                    for record in read_records(log_file):
+                        index_file.write(struct.pack(INDEX_ENTRY, offset, record[4], record[5]))
+                        offset += len(record) + 2
+                        count += 1
+                else:
+                    for line in log_file:
+                        try:
+                            log_entry = json.loads(line.decode())
+                            level_code, group_code = entry_codes(log_entry['level'], log_entry['group'])
+                            index_file.write(struct.pack(INDEX_ENTRY, offset, level_code, group_code))
+                            count += 1
+                        except (ValueError, KeyError):
+                            pass
+                        offset += len(line)
+        except OSError:
+            with open(temp_name, 'wb') as index_file:
+                pass
+        try:
+            os.remove(self.index_name(index))
+        except OSError:
+            pass
+        os.rename(temp_name, self.index_name(index))
+        return count
+
+    """
+    Logger.repair_index(index: int)
+    Makes sure the sidecar index of a segment can be used, rebuilding it from the log if it is missing or does not
+    match, e.g. left by older firmware or cut by a reset. Rebuilt once; later reads find it valid.
+
+    Parameters:
+    index (int): Index of the segment.
+
+    Returns:
+    bool: True if the index can be used, False if it could not be rebuilt (e.g. read-only storage).
+    """
+    def repair_index(self, index):
+        if self.check_index(index):
+            return True
+        if self.readonly:
+            return False
+        try:
+            self.rebuild_index(index)
+        except OSError as e:
+            print('error:', str(e))
+            return False
+        return self.check_index(index)
+
+    """
+    Logger.rotate()
+    Starts a new log file. Every step is a single rename or remove, so a reset in the middle loses at most the
+    oldest segment and never leaves a partly written file.
+
+    Parameters: VOID
+    Returns: VOID
+    """
+    def rotate(self):
+        for name in (self.segment_name(self.segments), self.index_name(self.segments)):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+        for index in range(self.segments - 1, -1, -1):
+            for name, new_name in ((self.segment_name(index), self.segment_name(index + 1)), (self.index_name(index), self.index_name(index + 1))):
+                try:
+                    os.rename(name, new_name)
+                except OSError:
+                    pass
+        self.sequence += 1
+        self.size = 0
+
+    """
+    Logger.write(entries: list, codes: list)
+    Appends entries to the log file, rotating it first if they would take it past max_size, and their offsets and
+    codes to the sidecar index.
+
+    Parameters:
+    entries (list): Encoded entries, JSON lines or binary records, as bytes.
+    codes (list): (level code, group code) of each entry, see entry_codes().
+
+    Returns: VOID
+    """
+    def write(self, entries, codes):
+        data = b''.join(entries)
+        if self.max_size > 0 and self.size > 0 and self.size + len(data) > self.max_size:
+            self.rotate()
+        with open(self.filename, 'ab') as log_file:
+            log_file.write(data)
+        offset = self.size
+        self.size += len(data)
+        if self.indexed:
+            index = bytearray()
+            for entry, (level_code, group_code) in zip(entries, codes):
+                index += struct.pack(INDEX_ENTRY, offset, level_code, group_code)
+                offset += len(entry)
+            with open(self.index_name(0), 'ab') as index_file:
+                index_file.write(index)
+
+    """
+    Logger.add(message: str, level: str = 'INFO', group: str = 'SYS', template: str = None, args: tuple = None)
+    Adds a log entry to the console, the RAM ring and the log file (or the queue in buffered mode) whose minimum
+    levels it meets, unless no sink accepts it or the rate limiter drops it.
+    With args the message is a % format string, e.g. add("$PARAM{LIMIT=%s}", args=(limit,)), only formatted once the
+    entry is accepted, so callers do not build strings for entries that are dropped.
+
+    Parameters:
+    message (str): Log message to add, or its format string with args.
+    level (str): Severity level of the log.
+    group (str): Group identifier for the log.
+    template (str, optional): What repeats of this entry have in common, for rate limiting (default is None, the
+    message itself, unformatted with args).
+    args (tuple, optional): Arguments of the format string (default is None, the message is used as is).
+
+    Returns: VOID
+    """
+    def add(self, message, level='INFO', group='SYS', template=None, args=None):
+        if LEVELS.code(level) < self.min_level:
+            return
+        if self.rate_window and not self.allow(template or message, level, group, message, args):
+            return
+        if args is not None:
+            message = message % args
+        self.emit(message, level, group)
+
+    """
+    Logger.enabled(level: str = 'DEBUG')
+    Tells whether some sink accepts entries of a level, for callers that need real work to build a log message.
+
+    Parameters:
+    level (str): Severity level.
+
+    Returns:
+    bool: True if Logger.add() would keep an entry of this level.
+    """
+    def enabled(self, level='DEBUG'):
+        return LEVELS.code(level) >= self.min_level
+
+    """
+    Logger.allow(template: str, level: str, group: str, message: str = None, args: tuple = None)
+    Counts an entry against the rate limit of its key. A dropped entry keeps its message and args, unformatted, so
+    closing a window in which entries were dropped adds the last of them with "(repeated N times)".
+
+    Parameters:
+    template (str): Template of the entry.
+    level (str): Severity level of the entry.
+    group (str): Group identifier of the entry.
+    message (str, optional): Message or format string of the entry (default is None, the template).
+    args (tuple, optional): Arguments of the format string (default is None).
+
+    Returns:
+    bool: True if the entry may be added.
+    """
+    def allow(self, template, level, group, message=None, args=None):
+        key = (level, group, template)
+        now = time.monotonic_ns()
+        state = self.rate_limits.get(key)
+        if state is None:
+            if len(self.rate_limits) >= MAX_RATE_KEYS:
+                self.sweep(now)
+                if len(self.rate_limits) >= MAX_RATE_KEYS:
+                    return True
+            self.rate_limits[key] = [now, 1, 0, None, None]
+            return True
+        if now - state[0] >= self.rate_window:
+            if state[2]:
+                self.repeated(state, level, group)
+            state[0] = now
+            state[1] = 1
+            state[2] = 0
+            return True
+        state[1] += 1
+        if state[1] <= self.rate_burst:
+            return True
+        state[2] += 1
+        state[3] = template if message is None else message
+        state[4] = args
+        return False
+
+    """
+    Logger.repeated(state: list, level: str, group: str)
+    Adds the "(repeated N times)" entry of a rate limiting window from the last message it dropped.
+
+    Parameters:
+    state (list): Rate limiting state of the key, [window start, count, dropped, message, args].
+    level (str): Severity level of the key.
+    group (str): Group identifier of the key.
+
+    Returns: VOID
+    """
+    def repeated(self, state, level, group):
+        message = state[3] if state[4] is None else state[3] % state[4]
+        self.emit(message + " (repeated " + str(state[2]) + " times)", level, group)
+
+    """
+    Logger.sweep(now: int)
+    Closes the rate limiting windows that have ended: adds the "(repeated N times)" entries and forgets the keys.
+
+    Parameters:
+    now (int): time.monotonic_ns().
+
+    Returns: VOID
+    """
+    def sweep(self, now):
+        for key in list(self.rate_limits):
+            state = self.rate_limits[key]
+            if now - state[0] >= self.rate_window:
+                del self.rate_limits[key]
+                if state[2]:
+                    self.repeated(state, key[0], key[1])
+
+    """
+    Logger.emit(message: str, level: str, group: str)
+    Writes an entry to every sink whose minimum level it meets, see Logger.add(). The time is only formatted and the
+    JSON line only built when a sink needs them.
+
+    Parameters:
+    message (str): Log message to add.
+    level (str): Severity level of the log.
+    group (str): Group identifier for the log.
+
+    Returns: VOID
+    """
+    def emit(self, message, level, group):
+        rank = LEVELS.code(level)
+        console = rank >= self.console_level
+        to_file = rank >= self.file_level
+        # Create a log dict
+        epoch = int(time.time())
+        if rank >= self.ram_level:
+            self.ram.push(epoch, level, group, message)
+        if console or (to_file and not self.binary):
+            log_entry = {
+                'level': level,
+                'group': group,
+                'sysdt': format_time(epoch),
+                'message': message
+            }
+            line = json.dumps(log_entry)
+            if console:
+                print(line)
+        if not to_file:
+            return
+        data = encode_record(epoch, level, group, message) if self.binary else (line + '\n').encode()
+        codes = entry_codes(level, group)
+        if self.buffer_size <= 0:
+            # Append to the bottom of the log file
+            self.write((data,), (codes,))
+            return
+        if not self.pending:
+            self.pending_since = time.monotonic_ns()
+        self.pending.append(data)
+        self.pending_codes.append(codes)
+        if level == 'ERROR' or len(self.pending) >= self.buffer_size:
+            self.flush()
+
+    """
+    Logger.flush()
+    Appends every queued entry to the log file with a single open and write.
+
+    Parameters: VOID
+    Returns:
+    int: Number of entries written.
+    """
+    def flush(self):
+        count = len(self.pending)
+        if count and not self.readonly:
+            entries = self.pending
+            codes = self.pending_codes
+            self.pending = []
+            self.pending_codes = []
+            try:
+                self.write(entries, codes)
+            except OSError as e:
+                print('error:', str(e))
+                return 0
+        return count
+
+    """
+    Logger.poll()
+    Closes ended rate limiting windows, at most twice per window, and flushes the queue if its oldest entry has
+    waited flush_interval seconds. Meant to be called when the main loop is idle.
+
+    Parameters: VOID
+    Returns:
+    int: Number of entries written.
+    """
+    def poll(self):
+        if self.rate_limits:
+            now = time.monotonic_ns()
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.rate_window // 2
+                self.sweep(now)
+        if self.pending and time.monotonic_ns() - self.pending_since >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    """
+    Logger.read(limit: int = 5, level: str = None, group: str = None)
+    Reads log entries newest first. The RAM ring answers alone when it holds limit matching entries and keeps the same
+    levels as the log file, or when the storage is read-only. Otherwise the log file and then the rotated segments are read, queued entries flushed first.
+    Filtered reads go through the sidecar index of a segment when it matches the log, see Logger.scan_index().
+
+    Parameters:
+    limit (int): The maximum number of log entries to return.
+    level (str): Filter logs by severity level.
+    group (str): Filter logs by group identifier.
+
+    Returns:
+    list: A list of log entries, possibly empty.
+    """
+    def read(self, limit=5, level=None, group=None):
+        if self.ram is not None:
+            filtered_logs = self.ram.read(limit, level, group)
+            if (len(filtered_logs) >= limit and self.ram_level == self.file_level) or self.readonly:
+                return filtered_logs
+        self.flush()
+        filtered_logs = []
+        self.read_back(limit, level, group, None, None, filtered_logs)
+        return filtered_logs
+
+    """
+    Logger.query(limit: int = 15, level: str = None, group: str = None, since: int = None, until: int = None, cursor: str = None)
+    Reads a page of log entries. Without a valid cursor this is the newest limit matching entries; with the cursor
+    returned by a previous query, the oldest limit matching entries written after that query's page, so a client
+    polling with its last cursor only receives entries it has not seen and the log is only read from there.
+    The cursor is the log file number and the byte offset in it (the entry number in read-only mode) and is only
+    valid until the next reset; an invalid cursor counts as none, see Logger.resumes().
+
+    Parameters:
+    limit (int): The maximum number of log entries to return.
+    level (str): Filter logs by severity level.
+    group (str): Filter logs by group identifier.
+    since (int): Only entries at or after this epoch.
+    until (int): Only entries at or before this epoch.
+    cursor (str): Cursor of the previous page.
+
+    Returns:
+    tuple: (entries newest first, cursor of the next page).
+    """
+    def query(self, limit=15, level=None, group=None, since=None, until=None, cursor=None):
+        position = self.parse_cursor(cursor)
+        resume = self.resumes(position)
+        if self.readonly:
+            if self.ram is None:
+                return [], None
+            entries, number = self.ram.query(limit, level, group, since, until, position[1] if resume else None)
+            return entries, self.boot + ".R." + str(number)
+        self.flush()
+        since_text = None if since is None else format_time(since)
+        until_text = None if until is None else format_time(until)
+        entries = []
+        if not resume:
+            self.read_back(limit, level, group, since_text, until_text, entries)
+            sequence, offset = self.sequence, self.size
+        else:
+            sequence, offset = self.read_forward(position[0], position[1], limit, level, group, since_text, until_text, entries)
+            entries.reverse()
+        return entries, self.boot + "." + str(sequence) + "." + str(offset)
+
+    """
+    Logger.parse_cursor(cursor: str)
+    Decodes a cursor returned by Logger.query().
+
+    Parameters:
+    cursor (str): The cursor.
+
+    Returns:
+    tuple: (log file number or None for a RAM ring cursor, offset or entry number), None if the cursor is not valid.
+    """
+    def parse_cursor(self, cursor):
+        if not cursor:
+            return None
+        fields = cursor.split(".")
+        if len(fields) != 3 or fields[0] != self.boot:
+            return None
+        try:
+            return None if fields[1] == "R" else int(fields[1]), int(fields[2])
+        except ValueError:
+            return None
+
+    """
+    Logger.resumes(position: tuple)
+    Tells whether Logger.query() continues from a decoded cursor. It does not for a cursor of another boot, of the
+    other storage mode or of a log file that does not exist yet; query() then returns the newest page instead, so
+    a client that keeps what it already has must start over.
+
+    Parameters:
+    position (tuple): The cursor decoded by Logger.parse_cursor(), or None.
+
+    Returns:
+    bool: True if the query reads on from the cursor.
+    """
+    def resumes(self, position):
+        if position is None:
+            return False
+        if self.readonly:
+            return position[0] is None
+        return position[0] is not None and position[0] <= self.sequence
+
+    """
+    Logger.read_back(limit: int, level: str, group: str, since_text: str, until_text: str, entries: list)
+    Reads the log file and then the rotated segments backwards, see Logger.scan() and Logger.scan_index().
+
+    Parameters:
+    limit (int): The maximum number of entries.
+    level (str): Filter logs by severity level, or None.
+    group (str): Filter logs by group identifier, or None.
+    since_text (str): Only entries at or after this formatted time, or None.
+    until_text (str): Only entries at or before this formatted time, or None.
+    entries (list): Entries found so far, appended in place.
+
+    Returns: VOID
+    """
+    def read_back(self, limit, level, group, since_text, until_text, entries):
+        for index in range(self.segments + 1 if self.max_size > 0 else 1):
+            if len(entries) >= limit:
+                break
+            try:
+                with open(self.segment_name(index), 'rb') as log_file:
+                    if self.indexed and (level is not None or group is not None) and self.repair_index(index):
+                        done = self.scan_index(index, log_file, limit, level, group, since_text, until_text, entries)
+                    else:
+                        done = self.scan(log_file, limit, level, group, since_text, until_text, entries)
+                if done:
+                    break
+            except OSError:
+                # Rotated segments appear as the log grows
+                if index == 0:
+                    print('error: can not open ' + self.filename)
+                    break
+            except Exception as e:
+                print('error:', str(e))
+                break
+
+    """
+    Logger.read_forward(sequence: int, offset: int, limit: int, level: str, group: str, since_text: str, until_text: str, entries: list)
+    Reads the log forward from a position, through the newer segments up to the end of the log file. A position in a
+    segment that was rotated away restarts at the oldest segment kept, a position past the end of the log file (the
+    log was cleared) at its start.
+
+    Parameters:
+    sequence (int): Number of the log file, see Logger.sequence.
+    offset (int): Byte offset in that file.
+    limit (int): The maximum number of entries.
+    level (str): Filter logs by severity level, or None.
+    group (str): Filter logs by group identifier, or None.
+    since_text (str): Only entries at or after this formatted time, or None.
+    until_text (str): Only entries at or before this formatted time, or None.
+    entries (list): Entries found so far, appended in place, oldest first.
+
+    Returns:
+    tuple: (log file number, offset) after the last entry read.
+    """
+    def read_forward(self, sequence, offset, limit, level, group, since_text, until_text, entries):
+        index = self.sequence - sequence
+        kept = self.segments if self.max_size > 0 else 0
+        if index > kept:
+            index = kept
+            offset = 0
+        if index == 0 and offset > self.size:
+            offset = 0
+        while True:
+            try:
+                with open(self.segment_name(index), 'rb') as log_file:
+                    log_file.seek(offset)
+                    for raw in (read_records(log_file) if self.binary else log_file):
+                        if self.binary:
+                            end = offset + len(raw) + 2
+                            log_entry = decode_record(raw)
+                        else:
+                            if raw[-1:] != b'\n':
+                                # Partly written line
+                                break
+                            end = offset + len(raw)
+                            try:
+                                log_entry = json.loads(raw.decode())
+                            except ValueError:
+                                offset = end
+                                continue
+                        offset = end
+                        if entry_matches(log_entry, level, group, since_text, until_text):
+                            entries.append(log_entry)
+                            if len(entries) >= limit:
+                                return self.sequence - index, offset
+            except OSError:
+                pass
+            if index == 0:
+                return self.sequence, offset
+            index -= 1
+            offset = 0
+
+    """
+    Logger.scan(log_file: file, limit: int, level: str, group: str, since_text: str, until_text: str, entries: list)
+    Scans one log file backwards from its end, see reverse_lines() and reverse_records(), and appends matching
+    entries until there are limit of them. Only the entries scanned are decoded; binary records of another level or
+    group are skipped on their header codes. JSON lines that can not be parsed, e.g. cut by a power loss, are skipped.
+
+    Parameters:
+    log_file (file): The file, opened with 'rb'.
+    limit (int): The maximum number of entries.
+    level (str): Filter logs by severity level, or None.
+    group (str): Filter logs by group identifier, or None.
+    since_text (str): Only entries at or after this formatted time, or None.
+    until_text (str): Only entries at or before this formatted time, or None.
+    entries (list): Entries found so far, appended in place.
+
+    Returns:
+    bool: True if the read is complete: limit reached or an entry older than since_text found.
+    """
+    def scan(self, log_file, limit, level, group, since_text, until_text, entries):
+        if self.binary:
+            level_code, group_code = entry_codes(level, group)
+            for record in reverse_records(log_file):
+                if (level_code is not None and level_code != record[4]) or (group_code is not None and group_code != record[5]):
+                    continue
+                log_entry = decode_record(record)
+                if since_text is not None and log_entry['sysdt'] < since_text:
+                    return True
+                if entry_matches(log_entry, level, group, None, until_text):
+                    entries.append(log_entry)
+                    if len(entries) >= limit:
+                        return True
+            return False
+        for line in reverse_lines(log_file):
+            try:
+                log_entry = json.loads(line.decode())
+            except ValueError:
+                continue
+            if since_text is not None and log_entry['sysdt'] < since_text:
+                return True
+            if entry_matches(log_entry, level, group, None, until_text):
+                entries.append(log_entry)
+                if len(entries) >= limit:
+                    return True
+        return False
+
+    """
+    Logger.scan_index(index: int, log_file: file, limit: int, level: str, group: str, since_text: str, until_text: str, entries: list)
+    Like Logger.scan(), but walks the sidecar index of the segment backwards and only reads and decodes the entries
+    whose codes match, seeking to their offsets.
+
+    Parameters:
+    index (int): Index of the segment.
+    log_file (file): The segment, opened with 'rb'.
+    limit (int): The maximum number of entries.
+    level (str): Filter logs by severity level, or None.
+    group (str): Filter logs by group identifier, or None.
+    since_text (str): Only entries at or after this formatted time, or None.
+    until_text (str): Only entries at or before this formatted time, or None.
+    entries (list): Entries found so far, appended in place.
+
+    Returns:
+    bool: True if the read is complete, see Logger.scan().
+    """
+    def scan_index(self, index, log_file, limit, level, group, since_text, until_text, entries):
+        level_code, group_code = entry_codes(level, group)
+        with open(self.index_name(index), 'rb') as index_file:
+            for offset in reverse_index(index_file, level_code, group_code):
+                log_file.seek(offset)
+                if self.binary:
+                    header = log_file.read(HEADER_SIZE)
+                    log_entry = decode_record(header + log_file.read(header[6] | header[7] << 8))
+                else:
+                    try:
+                        log_entry = json.loads(log_file.readline().decode())
+                    except ValueError:
+                        continue
+                if since_text is not None and log_entry['sysdt'] < since_text:
+                    return True
+                if entry_matches(log_entry, level, group, None, until_text):
+                    entries.append(log_entry)
+                    if len(entries) >= limit:
+                        return True
+        return False
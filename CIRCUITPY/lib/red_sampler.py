@@ -0,0 +1,133 @@
+import time
+from array import array
+
+
+class AdcSampler:
+
+    """
+    AdcSampler(names: list, channels: list, rate: float = 10, size: int = 64)
+    Samples analog channels at a fixed rate into preallocated array('H') ring buffers. Driven by calling poll()
+    from the main loop, no memory is allocated per sample.
+
+    Parameters:
+    names (list): Name of each channel.
+    channels (list): Objects with a .value property, e.g. analogio.AnalogIn.
+    rate (float): Samples per second for every channel, 0 disables sampling.
+    size (int): Number of samples kept per channel.
+
+    Returns: VOID
+    """
+    def __init__(self, names, channels, rate=10, size=64):
+        self.names = names
+        self.channels = channels
+        self.size = size
+        self.buffers = [array('H', (0 for _ in range(size))) for _ in channels]
+        self.head = 0
+        self.count = 0
+        self.set_rate(rate)
+
+    """
+    AdcSampler.set_rate(rate: float)
+    Changes the sampling rate.
+
+    Parameters:
+    rate (float): Samples per second for every channel, 0 disables sampling.
+
+    Returns: VOID
+    """
+    def set_rate(self, rate):
+        self.rate = rate
+        self.interval_ns = int(1000000000 / rate) if rate > 0 else 0
+        self.next_ns = time.monotonic_ns()
+
+    """
+    AdcSampler.poll()
+    Takes one sample of every channel if the next sample is due. Meant to be called on every main loop iteration.
+
+    Parameters: VOID
+
+    Returns:
+    bool: True if a sample was taken.
+    """
+    def poll(self):
+        if not self.interval_ns or not self.channels:
+            return False
+        now = time.monotonic_ns()
+        if now < self.next_ns:
+            return False
+        head = self.head
+        for channel, buffer in zip(self.channels, self.buffers):
+            buffer[head] = channel.value
+        self.head = (head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        self.next_ns += self.interval_ns
+        # Resync instead of bursting to catch up after a long stall
+        if self.next_ns < now:
+            self.next_ns = now + self.interval_ns
+        return True
+
+    """
+    AdcSampler.next_due()
+    Tells when poll() has work next, so the main loop can sleep until then.
+
+    Parameters: VOID
+
+    Returns:
+    int: time.monotonic_ns() of the next sample, or None if sampling is off.
+    """
+    def next_due(self):
+        if not self.interval_ns or not self.channels:
+            return None
+        return self.next_ns
+
+    """
+    AdcSampler.get_samples(channel: int, limit: int = None)
+    Retrieves the most recent samples of a channel.
+
+    Parameters:
+    channel (int): Index of the channel.
+    limit (int, optional): Maximum number of samples to return (default is None for all kept samples).
+
+    Returns:
+    list: Samples, oldest first.
+    """
+    def get_samples(self, channel, limit=None):
+        count = self.count if limit is None else min(limit, self.count)
+        buffer = self.buffers[channel]
+        start = self.head - count
+        return [buffer[(start + i) % self.size] for i in range(count)]
+
+    """
+    AdcSampler.get_stats(channel: int, limit: int = 0)
+    Computes min, max and mean over every kept sample of a channel.
+
+    Parameters:
+    channel (int): Index of the channel.
+    limit (int, optional): Number of recent samples to include in the result (default is 0).
+
+    Returns:
+    dict: count, min, max, mean and samples, min/max/mean are None before the first sample.
+    """
+    def get_stats(self, channel, limit=0):
+        buffer = self.buffers[channel]
+        count = self.count
+        if count == 0:
+            return {"count" : 0, "min" : None, "max" : None, "mean" : None, "samples" : []}
+        low = 65535
+        high = 0
+        total = 0
+        for i in range(count):
+            sample = buffer[i]
+            total += sample
+            if sample < low:
+                low = sample
+            if sample > high:
+                high = sample
+        return {
+            "count" : count,
+            "min" : low,
+            "max" : high,
+            "mean" : total / count,
+            "samples" : self.get_samples(channel, limit) if limit else []
+        }
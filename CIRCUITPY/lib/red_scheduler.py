@@ -0,0 +1,127 @@
+import time
+
+# Shortest delay between two polls in ns
+MIN_DELAY = 1000000
+
+
+class AdaptivePoller:
+
+    """
+    AdaptivePoller(min_delay: float = 0.005, max_delay: float = 0.2, burst: float = 2.0, factor: float = 2.0, burst_delay: float = 0.001)
+    Decides when the main loop polls the HTTP server. For burst seconds after a request the server is polled every
+    burst_delay seconds; after that the delay between polls starts at min_delay and grows by factor on every idle
+    poll, up to max_delay. burst_delay is never 0, so the loop still sleeps during a burst. Also keeps counters to
+    tune the latency/power trade-off.
+
+    Parameters:
+    min_delay (float): First delay in seconds once the burst window is over.
+    max_delay (float): Ceiling of the delay in seconds.
+    burst (float): Seconds of fast polling after a request.
+    factor (float): Growth of the delay on every idle poll.
+    burst_delay (float): Delay in seconds between polls during the burst, at least 1 ms.
+
+    Returns: VOID
+    """
+    def __init__(self, min_delay=0.005, max_delay=0.2, burst=2.0, factor=2.0, burst_delay=0.001):
+        self.burst_delay = max(int(burst_delay * 1000000000), MIN_DELAY)
+        self.min_delay = max(int(min_delay * 1000000000), self.burst_delay)
+        self.max_delay = max(int(max_delay * 1000000000), self.min_delay)
+        self.burst = int(burst * 1000000000)
+        self.factor = factor
+        self.delay = self.burst_delay
+        now = time.monotonic_ns()
+        self.next_poll = now
+        self.last_request = now - self.burst
+        self.reset_stats()
+
+    """
+    AdaptivePoller.reset_stats()
+    Restarts the counters.
+
+    Parameters: VOID
+
+    Returns: VOID
+    """
+    def reset_stats(self):
+        self.started = time.monotonic_ns()
+        self.polls = 0
+        self.requests = 0
+        self.serve_time = 0
+        self.idle_poll_time = 0
+        self.lag_total = 0
+        self.lagged = 0
+        self.lag_max = 0
+
+    """
+    AdaptivePoller.due(now: int)
+    Tells whether the server should be polled now.
+
+    Parameters:
+    now (int): time.monotonic_ns().
+
+    Returns:
+    bool: True if a poll is due.
+    """
+    def due(self, now):
+        return now >= self.next_poll
+
+    """
+    AdaptivePoller.record(start: int, end: int, handled: bool, scheduled: bool = True)
+    Records a poll and schedules the next one.
+
+    Parameters:
+    start (int): time.monotonic_ns() before the poll.
+    end (int): time.monotonic_ns() after the poll.
+    handled (bool): True if the poll handled a request.
+    scheduled (bool, optional): False for polls run on another schedule, e.g. the fixed poll rate, whose lag behind
+    this schedule means nothing and is not counted (default is True).
+
+    Returns: VOID
+    """
+    def record(self, start, end, handled, scheduled=True):
+        self.polls += 1
+        if scheduled:
+            lag = start - self.next_poll
+            self.lag_total += lag
+            self.lagged += 1
+            if lag > self.lag_max:
+                self.lag_max = lag
+        if handled:
+            self.requests += 1
+            self.serve_time += end - start
+            self.last_request = end
+        else:
+            self.idle_poll_time += end - start
+
+        if end - self.last_request < self.burst:
+            self.delay = self.burst_delay
+        elif self.delay < self.min_delay:
+            self.delay = self.min_delay
+        else:
+            self.delay = min(int(self.delay * self.factor), self.max_delay)
+        self.next_poll = end + self.delay
+
+    """
+    AdaptivePoller.get_stats()
+    Reports the counters since the last reset.
+
+    Parameters: VOID
+
+    Returns:
+    dict: polls, requests, current delay, mean and max poll lag (how late scheduled polls ran after being due, 0
+    without adaptive scheduling) in ms, and the share of time spent serving requests, polling idle and outside the
+    server.
+    """
+    def get_stats(self):
+        elapsed = max(time.monotonic_ns() - self.started, 1)
+        return {
+            "polls" : self.polls,
+            "requests" : self.requests,
+            "delay_ms" : self.delay / 1000000,
+            "lag_mean_ms" : self.lag_total / self.lagged / 1000000 if self.lagged else 0,
+            "lag_max_ms" : self.lag_max / 1000000,
+            "serving_pct" : self.serve_time * 100 / elapsed,
+            "idle_poll_pct" : self.idle_poll_time * 100 / elapsed,
+            "other_pct" : max(0, 100 - (self.serve_time + self.idle_poll_time) * 100 / elapsed),
+            "elapsed_s" : elapsed / 1000000000
+        }
@@ -0,0 +1,203 @@
+import os
+from adafruit_httpserver import FileResponse, Response, Status, OK_200, PARTIAL_CONTENT_206
+
+NOT_MODIFIED_304 = Status(304, "Not Modified")
+RANGE_NOT_SATISFIABLE_416 = Status(416, "Range Not Satisfiable")
+
+"""
+file_etag(path: str)
+Computes the ETag of a file from its size and modification time, without reading it. There is no Last-Modified:
+FAT times are local times of whatever wrote the file, and the board does not know its UTC offset.
+
+Parameters:
+path (str): Full path of the file.
+
+Returns:
+str: The ETag header value.
+
+Raises:
+OSError: If the file does not exist.
+"""
+def file_etag(path):
+    stat = os.stat(path)
+    return '"{:x}-{:x}"'.format(stat[6], int(stat[8]))
+
+
+"""
+file_variants(path: str)
+Computes the ETag of a file and of its pre-compressed sibling path + ".gz", if there is one.
+
+Parameters:
+path (str): Full path of the file.
+
+Returns:
+tuple: (plain ETag, gzip ETag or None), see file_etag().
+
+Raises:
+OSError: If the file does not exist.
+"""
+def file_variants(path):
+    plain = file_etag(path)
+    try:
+        return plain, file_etag(path + ".gz")
+    except OSError:
+        return plain, None
+
+
+"""
+is_not_modified(request: Request, etag: str)
+Evaluates the If-None-Match header of a request: a comma separated list of ETags, weak ones (W/"...") included, or *.
+
+Parameters:
+request (Request): The incoming request object.
+etag (str): ETag of the file.
+
+Returns:
+bool: True if the client copy is current and a 304 can be sent.
+"""
+def is_not_modified(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == etag or tag == "*" or (tag.startswith("W/") and tag[2:] == etag):
+            return True
+    return False
+
+
+"""
+not_modified_response(request: Request, headers: dict)
+Builds a 304 Not Modified response without body.
+
+Parameters:
+request (Request): The incoming request object.
+headers (dict): Validator and cache headers to repeat.
+
+Returns:
+Response: The response.
+"""
+def not_modified_response(request, headers):
+    return Response(request, "", status=NOT_MODIFIED_304, headers=headers)
+
+
+"""
+parse_range(header: str, size: int)
+Parses a Range header for a file of size bytes. Only a single byte range is supported, e.g. 'bytes=0-99',
+'bytes=100-' or 'bytes=-500' (the last 500 bytes).
+
+Parameters:
+header (str): The Range header, or None.
+size (int): Size of the file.
+
+Returns:
+tuple: (first byte, last byte) inclusive, None to send the whole file, or () if the range can not be satisfied.
+"""
+def parse_range(header, size):
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if not first:
+            count = int(last)
+            return (max(size - count, 0), size - 1) if count > 0 and size > 0 else ()
+        first = int(first)
+        last = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if last < first:
+        return None
+    if first >= size:
+        return ()
+    return first, min(last, size - 1)
+
+
+class FileRangeResponse(Response):
+
+    """
+    FileRangeResponse(request: Request, path: str, buffer: bytearray, content_type: str = "text/plain", headers: dict = None)
+    Streams a file, or the byte range asked by the Range header of the request with 206 and Content-Range, through a
+    caller-owned buffer like StaticFileResponse. The file size is read once when the response is created, so a file
+    that keeps growing, e.g. the log, is sent up to that size. An unsatisfiable range gets 416 with the current size.
+
+    Parameters:
+    request (Request): The incoming request object.
+    path (str): Full path of the file.
+    buffer (bytearray): Chunk buffer, reused across requests.
+    content_type (str, optional): Content-Type header (default is "text/plain").
+    headers (dict, optional): Additional headers.
+
+    Returns: VOID
+
+    Raises:
+    OSError: If the file does not exist.
+    """
+    def __init__(self, request, path, buffer, content_type="text/plain", headers=None):
+        size = os.stat(path)[6]
+        headers = headers or {}
+        headers["Accept-Ranges"] = "bytes"
+        byte_range = parse_range(request.headers.get("Range"), size)
+        status = OK_200
+        if byte_range is None:
+            byte_range = (0, size - 1)
+        elif byte_range:
+            status = PARTIAL_CONTENT_206
+            headers["Content-Range"] = "bytes {}-{}/{}".format(byte_range[0], byte_range[1], size)
+        else:
+            status = RANGE_NOT_SATISFIABLE_416
+            headers["Content-Range"] = "bytes */{}".format(size)
+            byte_range = (0, -1)
+        super().__init__(request, status=status, headers=headers, content_type=content_type)
+        self._path = path
+        self._first = byte_range[0]
+        self._length = byte_range[1] - byte_range[0] + 1
+        self._chunk = buffer
+        self._chunk_view = memoryview(buffer)
+
+    def _send(self):
+        self._send_headers(self._length, self._content_type)
+        remaining = self._length
+        if remaining and self._request.method != "HEAD":
+            with open(self._path, "rb") as file:
+                file.seek(self._first)
+                while remaining:
+                    size = file.readinto(self._chunk)
+                    if not size:
+                        break
+                    size = min(size, remaining)
+                    self._send_bytes(self._request.connection, self._chunk_view[:size])
+                    remaining -= size
+        self._close_connection()
+
+
+class StaticFileResponse(FileResponse):
+
+    """
+    StaticFileResponse(request: Request, filename: str, root_path: str, buffer: bytearray, **kwargs)
+    FileResponse that streams the file through a caller-owned buffer with readinto(), so serving a file allocates
+    no chunk-sized objects and peak memory per request is bounded by the buffer, whatever the file size.
+    Content-Length comes from the file size. Other keyword arguments are passed to FileResponse.
+
+    Parameters:
+    request (Request): The incoming request object.
+    filename (str): Path of the file relative to root_path.
+    root_path (str): Directory holding the file.
+    buffer (bytearray): Chunk buffer, reused across requests.
+
+    Returns: VOID
+    """
+    def __init__(self, request, filename, root_path, buffer, **kwargs):
+        super().__init__(request, filename, root_path, buffer_size=len(buffer), **kwargs)
+        self._chunk = buffer
+        self._chunk_view = memoryview(buffer)
+
+    def _send(self):
+        self._send_headers(self._file_length, self._content_type)
+        if not self._head_only:
+            with open(self._full_file_path, "rb") as file:
+                while True:
+                    size = file.readinto(self._chunk)
+                    if not size:
+                        break
+                    self._send_bytes(self._request.connection, self._chunk_view[:size])
+        self._close_connection()
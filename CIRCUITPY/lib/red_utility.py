@@ -10,6 +10,8 @@ import gc
 import storage
 import rtc
 import adafruit_ntp
+# Logger moved to red_logger, kept here for existing imports
+from red_logger import Logger
 
 class Network:
     
@@ -273,119 +275,3 @@ class Network:
         gc.collect()
         return available_networks
 
-
-class Logger:
-    
-    """
-    Logger(filename: str = 'syslog.txt', print_log: bool = True)
-    Initializes the logger system which manages application logs.
-
-    Parameters:
-    filename (str): Filename for the log file.
-    print_log (bool): Flag to enable logging to console.
-
-    Returns: VOID
-    """
-    def __init__(self, filename='syslog.txt', print_log=True):
-        self.filename = filename
-        self.print_log = print_log
-        self.readonly = storage.getmount('/').readonly
-        # Check if the log file exists, if not, create one
-        if not self.readonly:
-            try:
-                with open(self.filename, 'r') as log_file:
-                    pass
-            except OSError:
-                with open(self.filename, 'w') as log_file:
-                    log_file.write("")
-    
-    """
-    Logger.get_readonly()
-    Checks if the storage is in read-only mode.
-
-    Parameters: VOID
-    Returns:
-    bool: True if the storage read-only, False otherwise.
-    """
-    def get_readonly(self):
-        return self.readonly
-    
-    """
-    Logger.clear()
-    Clears the log file.
-
-    Parameters: VOID
-    Returns:
-    bool: True if the operation was successful, False otherwise.
-    """
-    def clear(self):
-        # Remove all content of the log file
-        if not self.readonly:
-            with open(self.filename, 'w') as log_file:
-                log_file.write("")
-                return True
-        return False
-    
-    """
-    Logger.add(message: str, level: str = 'INFO', group: str = 'SYS')
-    Adds a log entry to the log file.
-
-    Parameters:
-    message (str): Log message to add.
-    level (str): Severity level of the log.
-    group (str): Group identifier for the log.
-
-    Returns: VOID
-    """
-    def add(self, message, level='INFO', group='SYS'):
-        # Create a log dict
-        current_time = time.localtime()
-        formatted_time = "{:04}-{:02}-{:02} {:02}:{:02}:{:02}".format(
-            current_time[0], current_time[1], current_time[2],
-            current_time[3], current_time[4], current_time[5]
-        )
-        log_entry = {
-            'level': level,
-            'group': group,
-            'sysdt': formatted_time,
-            'message': message
-        }
-        # Convert dict to json str and append to the bottom of the log file
-        if not self.readonly:
-            with open(self.filename, 'a') as log_file:
-                log_file.write(json.dumps(log_entry) + '\n')
-                if self.print_log:
-                    print(json.dumps(log_entry))
-        else:
-            print(json.dumps(log_entry))
-            
-    """
-    Logger.read(limit: int = 5, level: str = None, group: str = None)
-    Reads log entries from the log file.
-
-    Parameters:
-    limit (int): The maximum number of log entries to return.
-    level (str): Filter logs by severity level.
-    group (str): Filter logs by group identifier.
-
-    Returns:
-    list: A list of log entries, possibly empty.
-    """
-    def read(self, limit=5, level=None, group=None):
-        # Read limit lines from the bottom (recent) of the log file
-        try:
-            with open(self.filename, 'r') as log_file:
-                lines = log_file.readlines()
-                # Get the last `limit` lines
-                recent_logs = lines[::-1]  # Reverse the list to start from the bottom
-                filtered_logs = []
-                for line in recent_logs:
-                    log_entry = json.loads(line)
-                    if (level is None or log_entry['level'] == level) and (group is None or log_entry['group'] == group):
-                        filtered_logs.append(log_entry)
-                        if len(filtered_logs) >= limit:
-                            break
-                return filtered_logs
-        except Exception as e:
-            print('error:', str(e))
-            return []
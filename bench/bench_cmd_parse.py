@@ -0,0 +1,119 @@
+"""
+Host-side microbenchmark: per-request parse and dispatch cost of /cmd bodies.
+Compares the original chain (a re.search for the key, one substring scan per known command, a re.search per parameter)
+against red_command.parse_request followed by the handler table lookup of ApiServer.execute_commands(). Both start
+from the same request body as bytes, decode it and call a no-op handler per command, so only parsing and dispatch
+differ. Each figure is the best of several rounds.
+
+The chain is timed twice: with the 12 command strings of the original server, and with the fixed command strings the
+current handler table accepts for the default pin spec. The chain scans the whole body once per known string, so its
+cost grows with the command set, while the tokenizer only depends on the body; commands with free values such as
+SET_GPIO_MASK cannot be listed at all. On CPython the substring scans run in C and the 12 string chain stays ahead of
+the tokenizer; on the board re.search() also compiles its pattern on every call, which these host figures do not show.
+
+Usage: python3 bench/bench_cmd_parse.py [iterations] [rounds]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "lib"))
+from red_command import parse_request
+
+API_KEY = "H7tsXXXXrUfY"
+BODIES = {
+    "set_led": b"$AUTH{API_KEY=H7tsXXXXrUfY}$CMD{SET_BOARD_LED=ON}",
+    "get_sys_info": b"$AUTH{API_KEY=H7tsXXXXrUfY}$CMD{GET_SYS_INFO}",
+    "get_sys_log": b"$AUTH{API_KEY=H7tsXXXXrUfY}$CMD{GET_SYS_LOG},$PARAM{LIMIT=15},$PARAM{LEVEL=ERROR}",
+    "four_sets": b"$AUTH{API_KEY=H7tsXXXXrUfY}$CMD{SET_BOARD_LED=ON}$CMD{SET_BOARD_GP21=HIGH}"
+                 b"$CMD{SET_BOARD_GP20=LOW}$CMD{SET_BOARD_GP19=HIGH}",
+}
+LEGACY_COMMANDS = (
+    "$CMD{SET_BOARD_LED=ON}", "$CMD{SET_BOARD_LED=OFF}",
+    "$CMD{SET_BOARD_GP21=HIGH}", "$CMD{SET_BOARD_GP21=LOW}",
+    "$CMD{SET_BOARD_GP20=HIGH}", "$CMD{SET_BOARD_GP20=LOW}",
+    "$CMD{SET_BOARD_GP19=HIGH}", "$CMD{SET_BOARD_GP19=LOW}",
+    "$CMD{GET_SYS_INFO}", "$CMD{GET_SYS_LOG}", "$CMD{CLEAR_SYS_LOG}", "$CMD{RESET_SYS}",
+)
+CURRENT_COMMANDS = LEGACY_COMMANDS + tuple("$CMD{" + name + "}" for name in (
+    "GET_GPIO_MASK", "GET_PINS", "GET_ADC", "CAPTURE_ADC", "GET_CAPTURE", "ARM_SCOPE", "GET_SCOPE", "DISARM_SCOPE",
+    "CAPTURE_LOGIC", "GET_INPUT_EVENTS", "GET_COUNTERS", "RESET_COUNTERS", "GET_FREQUENCY", "GET_SERVER_STATS",
+    "SET_PIN=GP21:HIGH", "SET_PIN=GP21:LOW", "SET_PIN=GP20:HIGH", "SET_PIN=GP20:LOW",
+    "SET_PIN=GP19:HIGH", "SET_PIN=GP19:LOW", "GET_PIN=GP21", "GET_PIN=GP20", "GET_PIN=GP19",
+))
+HANDLER_NAMES = (
+    "SET_BOARD_LED", "SET_BOARD_GP21", "SET_BOARD_GP20", "SET_BOARD_GP19",
+    "GET_SYS_INFO", "GET_SYS_LOG", "CLEAR_SYS_LOG", "RESET_SYS",
+)
+
+
+def handler(value, parsed, text):
+    return 0, "", ""
+
+
+HANDLERS = {name : handler for name in HANDLER_NAMES}
+
+
+def legacy_get_param(raw_request, key_name):
+    match = re.search(r'\$PARAM\{' + key_name + r'\s*=\s*([^}]*)\}', raw_request)
+    if match:
+        return match.group(1).strip()
+    return False
+
+
+def legacy_request(body, commands=LEGACY_COMMANDS):
+    raw_request = body.decode("utf8")
+    match = re.search(r"\$AUTH\{API_KEY=([^}]+)\}", raw_request)
+    if not match or match.group(1) != API_KEY:
+        return None
+    for command in commands:
+        if command in raw_request:
+            if command == "$CMD{GET_SYS_LOG}":
+                legacy_get_param(raw_request, "LIMIT")
+                legacy_get_param(raw_request, "LEVEL")
+            handler(None, None, command)
+    return True
+
+
+def current_request(body):
+    return legacy_request(body, CURRENT_COMMANDS)
+
+
+def single_pass_request(body):
+    parsed = parse_request(body.decode("utf8"))
+    if parsed.api_key != API_KEY:
+        return None
+    for name, value, text, params in parsed.commands:
+        command = HANDLERS.get(name)
+        if command is not None:
+            command(value, parsed, text)
+    return True
+
+
+def measure(func, body, iterations, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(body)
+        elapsed = (time.perf_counter() - start) / iterations * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f"{iterations} iterations, best of {rounds} rounds, parse and dispatch from the body bytes")
+    print(f"{len(LEGACY_COMMANDS)} original and {len(CURRENT_COMMANDS)} current command strings in the chain")
+    print(f"{'request':<14}{'chain 12 us':>12}{'speedup':>9}{'chain cur us':>14}{'speedup':>9}{'single-pass us':>16}")
+    for name, body in BODIES.items():
+        legacy = measure(legacy_request, body, iterations, rounds)
+        current = measure(current_request, body, iterations, rounds)
+        single = measure(single_pass_request, body, iterations, rounds)
+        print(f"{name:<14}{legacy:>12.2f}{legacy / single:>8.2f}x{current:>14.2f}{current / single:>8.2f}x{single:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Host-side benchmark: cost of one Logger.add() call on the accepted and the dropped paths.
+
+The message is the verbose GET_SYS_LOG entry of ApiServer.cmd_get_sys_log(), built at the call site ("eager") or
+passed as a format string with args ("lazy"). Accepted entries go to the RAM ring and the buffered log file queue;
+the queue is flushed outside the timed calls. Dropped entries are INFO entries with every sink at WARN, or repeats
+past the rate limiter burst. The console sink is off so print() does not dominate the host times.
+
+Usage: python3 bench/bench_log_add.py [calls]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "lib"))
+from red_logger import Logger
+
+TEMPLATE = "$CMD{GET_SYS_LOG},$PARAM{LIMIT=%s},$PARAM{LEVEL=%s}"
+
+
+def run(calls, path, lazy, threshold, rate_window):
+    logger = Logger(filename=path, print_log=False, buffer_size=64, flush_interval=3600, file_level=threshold, ram_level=threshold, rate_window=rate_window, rate_burst=5)
+    logger.clear()
+    limit = 15
+    level = None
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter_ns()
+        if lazy:
+            logger.add(TEMPLATE, args=(limit, level))
+        else:
+            logger.add("$CMD{GET_SYS_LOG},$PARAM{LIMIT="+str(limit)+"},$PARAM{LEVEL="+str(level)+"}", template=TEMPLATE)
+        latencies.append(time.perf_counter_ns() - start)
+        if len(logger.pending) >= 63:
+            logger.flush()
+    logger.flush()
+    latencies.sort()
+    return {
+        "mean_us" : sum(latencies) / len(latencies) / 1000,
+        "p50_us" : latencies[len(latencies) // 2] / 1000,
+        "p99_us" : latencies[int(len(latencies) * 0.99)] / 1000,
+    }
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "syslog.txt")
+        print(f"{calls} Logger.add() calls per case")
+        print(f"{'case':<28}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+        for label, lazy, threshold, rate_window in (
+            ("accepted, eager", False, "DEBUG", 0),
+            ("accepted, lazy", True, "DEBUG", 0),
+            ("below threshold, eager", False, "WARN", 0),
+            ("below threshold, lazy", True, "WARN", 0),
+            ("rate limited, eager", False, "DEBUG", 3600),
+            ("rate limited, lazy", True, "DEBUG", 3600),
+        ):
+            result = run(calls, path, lazy, threshold, rate_window)
+            print(f"{label:<28}{result['mean_us']:>10.2f}{result['p50_us']:>10.2f}{result['p99_us']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Host-side benchmark: latency of a verbose /cmd request with the write-through Logger against the buffered Logger.
+
+Each simulated request parses a command body and logs it like ApiServer.cmd_set_pin() does with verbose_log=True.
+The log goes to a temporary syslog.txt. Host filesystems are far faster than the Pico W flash, so the host times
+understate the difference; the file opens per 1000 requests are the figure that carries over to the board.
+
+Usage: python3 bench/bench_log_buffer.py [requests] [buffer_size]
+"""
+import builtins
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "lib"))
+from red_command import parse_request
+from red_logger import Logger
+
+BODY = "$AUTH{API_KEY=0123456789abcdef},$CMD{SET_PIN=GP21:HIGH}"
+
+
+def run(requests, buffer_size, path):
+    logger = Logger(filename=path, print_log=False, buffer_size=buffer_size, flush_interval=3600)
+    logger.clear()
+    opens = [0]
+    real_open = builtins.open
+
+    def counting_open(*args, **kwargs):
+        opens[0] += 1
+        return real_open(*args, **kwargs)
+
+    builtins.open = counting_open
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter_ns()
+            parsed = parse_request(BODY)
+            for name, value, text, params in parsed.commands:
+                logger.add("$CMD{" + text + "}")
+            latencies.append(time.perf_counter_ns() - start)
+        # Idle poll at the end of the burst
+        logger.flush()
+    finally:
+        builtins.open = real_open
+    latencies.sort()
+    return {
+        "mean_us" : sum(latencies) / len(latencies) / 1000,
+        "p50_us" : latencies[len(latencies) // 2] / 1000,
+        "p99_us" : latencies[int(len(latencies) * 0.99)] / 1000,
+        "opens_per_1000" : opens[0] * 1000 / requests,
+    }
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    buffer_size = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "syslog.txt")
+        print(f"{requests} verbose requests, buffered mode queues {buffer_size} entries")
+        print(f"{'mode':<14}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'opens/1000':>12}")
+        for label, size in (("write-through", 0), ("buffered", buffer_size)):
+            result = run(requests, size, path)
+            print(f"{label:<14}{result['mean_us']:>10.1f}{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}{result['opens_per_1000']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
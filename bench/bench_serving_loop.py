@@ -0,0 +1,93 @@
+"""
+Host-side benchmark: request latency and CPU use of the serving loops, measured on the real ApiServer.
+
+The board modules are replaced by host_stubs, whose Server injects /cmd requests at Poisson arrival times and serves
+them through the real /cmd route, so the command parsing, dispatch, logging and the scheduling of ApiServer.poll()
+and ApiServer.run_async() are what is timed. Three loops are compared: the code.py main loop with the fixed poll rate
+and with the adaptive scheduler, and asyncio.run(api_server.run_async()). The CPU column is process time over wall
+time; a loop that spins instead of sleeping shows close to 100%. Host times are much shorter than the Pico W ones, the
+latency spread set by the scheduling is the figure that carries over.
+
+Usage: python3 bench/bench_serving_loop.py [requests] [requests_per_second] [poll_rate]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import host_stubs
+from red_api_server import ApiServer
+from red_logger import Logger
+
+API_KEY = "0123456789abcdef"
+BODIES = (
+    b"$AUTH{API_KEY=0123456789abcdef},$CMD{SET_PIN=GP21:HIGH}",
+    b"$AUTH{API_KEY=0123456789abcdef},$CMD{GET_PINS}",
+    b"$AUTH{API_KEY=0123456789abcdef},$CMD{GET_ADC},$PARAM{SAMPLES=8}",
+)
+
+
+def schedule(count, rate, seed=1):
+    rng = random.Random(seed)
+    t = time.monotonic() + 0.1
+    requests = []
+    for index in range(count):
+        t += rng.expovariate(rate)
+        requests.append((t, "/cmd", BODIES[index % len(BODIES)]))
+    return requests
+
+
+def run_loop(api):
+    while not api.api_server.done():
+        api.poll()
+        api.wait()
+
+
+async def run_async(api):
+    task = asyncio.create_task(api.run_async())
+    while not api.api_server.done():
+        await asyncio.sleep(0.05)
+    task.cancel()
+
+
+def measure(api, mode, requests):
+    api.start(poll_rate=api.poll_rate, adaptive=mode == "adaptive")
+    api.api_server.schedule(requests)
+    wall = time.monotonic()
+    cpu = time.process_time()
+    if mode == "asyncio":
+        asyncio.run(run_async(api))
+    else:
+        run_loop(api)
+    wall = time.monotonic() - wall
+    cpu = time.process_time() - cpu
+    latencies = sorted(api.api_server.latencies)
+    return {
+        "p50_ms" : latencies[len(latencies) // 2] * 1000,
+        "p99_ms" : latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "max_ms" : latencies[-1] * 1000,
+        "cpu_pct" : cpu * 100 / wall,
+        "polls_per_s" : api.api_server.polls / wall,
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    poll_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    with tempfile.TemporaryDirectory() as folder:
+        logger = Logger(filename=os.path.join(folder, "syslog.txt"), print_log=False, buffer_size=16)
+        api = ApiServer(pool=None, ip="127.0.0.1", port=80, api_key=API_KEY, logger=logger)
+        api.poll_rate = poll_rate
+        print(f"{count} requests per mode, {rate} req/s, poll_rate {poll_rate}s")
+        print(f"{'mode':<10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'cpu %':>8}{'polls/s':>10}")
+        for mode in ("poll", "adaptive", "asyncio"):
+            result = measure(api, mode, schedule(count, rate))
+            print(f"{mode:<10}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['max_ms']:>10.1f}"
+                  f"{result['cpu_pct']:>8.0f}{result['polls_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Minimal host stand-ins for the CircuitPython modules red_api_server needs (board, digitalio, analogio, countio,
+microcontroller, the network modules and adafruit_httpserver), so benchmarks can import and drive the real
+ApiServer with a desktop Python 3. Pins read constant levels; nothing here touches hardware or the network.
+
+The stub adafruit_httpserver.Server serves scripted requests instead of a socket: StubServer.schedule() queues
+(arrival time, path, body) tuples, and poll() handles at most one request whose arrival time has passed through the
+registered route, like the real Server.poll(), recording its latency from arrival to response.
+
+Usage: import host_stubs before any module of /CIRCUITPY/lib.
+"""
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "lib"))
+
+NO_REQUEST = "no_request"
+REQUEST_HANDLED_RESPONSE_SENT = "request_handled_response_sent"
+
+
+class Pin:
+
+    def __init__(self, name):
+        self.name = name
+
+
+class DigitalInOut:
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = None
+        self.pull = None
+        self.value = False
+
+    def deinit(self):
+        pass
+
+
+class AnalogIn:
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.value = 32768
+
+    def deinit(self):
+        pass
+
+
+class Counter:
+
+    def __init__(self, pin, edge=None, pull=None):
+        self.pin = pin
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+
+class Status:
+
+    def __init__(self, code, text):
+        self.code = code
+        self.text = text
+
+
+class Headers(dict):
+
+    def get(self, name, default=None):
+        return super().get(name, default)
+
+
+class Request:
+
+    def __init__(self, method, path, body=b"", headers=None):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.raw_request = body
+        self.headers = Headers(headers or {})
+        self.query_params = Headers()
+        self.connection = None
+
+
+class Response:
+
+    def __init__(self, request, body="", status=None, headers=None, content_type="text/plain"):
+        self._request = request
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self._content_type = content_type
+
+
+class FileResponse(Response):
+
+    def __init__(self, request, filename, root_path=None, buffer_size=1024, **kwargs):
+        super().__init__(request, headers=kwargs.get("headers"), content_type=kwargs.get("content_type", "text/plain"))
+
+
+class StubServer:
+
+    def __init__(self, pool, root_path=None, debug=False):
+        self.routes = {}
+        self.headers = {}
+        self.requests = []
+        self.next_request = 0
+        self.latencies = []
+        self.polls = 0
+
+    def route(self, path, method="GET"):
+        def register(handler):
+            self.routes[(path, method)] = handler
+            return handler
+        return register
+
+    def start(self, host, port):
+        pass
+
+    def schedule(self, requests):
+        self.requests = requests
+        self.next_request = 0
+        self.latencies = []
+        self.polls = 0
+
+    def done(self):
+        return self.next_request >= len(self.requests)
+
+    def poll(self):
+        self.polls += 1
+        if self.done() or self.requests[self.next_request][0] > time.monotonic():
+            return NO_REQUEST
+        arrival, path, body = self.requests[self.next_request]
+        self.next_request += 1
+        self.routes[(path, "POST")](Request("POST", path, body))
+        self.latencies.append(time.monotonic() - arrival)
+        return REQUEST_HANDLED_RESPONSE_SENT
+
+
+def module(name, **attributes):
+    stub = types.ModuleType(name)
+    stub.__dict__.update(attributes)
+    sys.modules[name] = stub
+    return stub
+
+
+def install():
+    module("board", __getattr__=lambda name: Pin(name))
+    module("digitalio", DigitalInOut=DigitalInOut, Direction=types.SimpleNamespace(INPUT="INPUT", OUTPUT="OUTPUT"),
+           Pull=types.SimpleNamespace(UP="UP", DOWN="DOWN"))
+    module("analogio", AnalogIn=AnalogIn)
+    module("countio", Counter=Counter, Edge=types.SimpleNamespace(RISE="RISE"))
+    module("microcontroller", cpu=types.SimpleNamespace(temperature=25.0, frequency=125000000), reset=lambda: None)
+    radio = types.SimpleNamespace(ipv4_subnet="255.255.255.0", ipv4_gateway="127.0.0.1", ipv4_address="127.0.0.1", connected=True)
+    module("wifi", radio=radio)
+    module("socketpool", SocketPool=lambda radio: None)
+    module("ipaddress", IPv4Address=str, ip_address=str)
+    module("adafruit_requests", Session=lambda *args: None)
+    module("storage", getmount=lambda path: types.SimpleNamespace(readonly=False))
+    module("rtc", RTC=lambda: types.SimpleNamespace(datetime=None))
+    module("adafruit_ntp", NTP=lambda *args, **kwargs: None)
+    module("adafruit_httpserver", Server=StubServer, Request=Request, Response=Response, FileResponse=FileResponse,
+           Status=Status, MIMETypes=types.SimpleNamespace(get_for_filename=lambda filename: "text/plain"),
+           GET="GET", POST="POST", NO_REQUEST=NO_REQUEST, REQUEST_HANDLED_RESPONSE_SENT=REQUEST_HANDLED_RESPONSE_SENT,
+           OK_200=Status(200, "OK"), PARTIAL_CONTENT_206=Status(206, "Partial Content"),
+           UNAUTHORIZED_401=Status(401, "Unauthorized"), NOT_FOUND_404=Status(404, "Not Found"),
+           INTERNAL_SERVER_ERROR_500=Status(500, "Internal Server Error"),
+           FileNotExistsError=OSError, InvalidPathError=ValueError)
+
+
+install()
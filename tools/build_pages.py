@@ -0,0 +1,87 @@
+"""
+Host-side build step for the web pages.
+
+Minifies every CIRCUITPY/page/*.html and writes a gzip sibling (web_gui.html.gz, ...) next to it. The board never
+compresses anything: ApiServer.serve_file() sends the .gz bytes with Content-Encoding: gzip to clients that accept
+it, and the plain file otherwise. The server does not check whether a .gz is current, so rerun this script after
+editing a page.
+
+Usage: python3 tools/build_pages.py [page_dir]
+"""
+import gzip
+import os
+import re
+import sys
+
+PAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "page")
+
+COMMENT = re.compile(r"<!--.*?-->", re.S)
+PRESERVED = re.compile(r"(<(pre|textarea)\b.*?</\2>)", re.S | re.I)
+
+
+"""
+minify_html(html: str)
+Conservative minification: drops HTML comments, indentation, blank lines and full-line // comments. Line breaks are
+kept so inline scripts keep their semicolon insertion, and <pre>/<textarea> content is left untouched.
+
+Parameters:
+html (str): The page.
+
+Returns:
+str: The minified page.
+"""
+def minify_html(html):
+    html = COMMENT.sub("", html)
+    out = []
+    for i, part in enumerate(PRESERVED.split(html)):
+        if i % 3 == 2:
+            continue
+        if i % 3 == 1:
+            out.append(part)
+            continue
+        lines = []
+        for line in part.split("\n"):
+            line = line.strip()
+            if line and not line.startswith("//"):
+                lines.append(line)
+        text = "\n".join(lines)
+        # Keep a separator where the chunk borders a preserved block
+        if part[:1].isspace() and out:
+            text = "\n" + text
+        if part[-1:].isspace() and text:
+            text += "\n"
+        out.append(text)
+    return "".join(out)
+
+
+"""
+build_page(path: str)
+Writes the gzip sibling of a page. mtime is zeroed so unchanged pages produce identical files.
+
+Parameters:
+path (str): Path of the .html file.
+
+Returns:
+tuple: (original size, minified size, gzip size) in bytes.
+"""
+def build_page(path):
+    with open(path, "r", encoding="utf-8") as file:
+        html = file.read()
+    data = minify_html(html).encode("utf-8")
+    packed = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + ".gz", "wb") as file:
+        file.write(packed)
+    return len(html.encode("utf-8")), len(data), len(packed)
+
+
+def main():
+    page_dir = sys.argv[1] if len(sys.argv) > 1 else PAGE_DIR
+    for name in sorted(os.listdir(page_dir)):
+        if not name.endswith(".html"):
+            continue
+        original, minified, packed = build_page(os.path.join(page_dir, name))
+        print(f"{name:<24} {original:>7} B -> minified {minified:>7} B -> gzip {packed:>6} B ({original / packed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Host-side converter between the two syslog formats of red_logger.Logger: JSON lines (syslog.txt) and packed binary
+records (syslog.bin, PICOW_LOG_FORMAT = "BINARY"). Copy the file off the CIRCUITPY drive, convert it, and read it or
+copy it back.
+
+Usage: python3 tools/convert_log.py <source> <target> [--to-binary | --to-json]
+The direction defaults to JSON -> binary when the source starts with '{', binary -> JSON otherwise.
+       python3 tools/convert_log.py --check
+Converts sample entries JSON -> binary in one host timezone and back in another, and checks that nothing changed.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CIRCUITPY", "lib"))
+from red_logger import convert_log
+
+SAMPLE = (
+    {"level" : "INFO", "group" : "SYS", "sysdt" : "2024-03-10 10:00:00", "message" : "System Started"},
+    {"level" : "WARN", "group" : "SYS", "sysdt" : "2024-07-01 23:59:59", "message" : "Unauthorized Request"},
+    {"level" : "NOTE", "group" : "PUMP", "sysdt" : "2024-11-03 01:30:00", "message" : "$CMD{SET_PIN=GP21:HIGH}"},
+)
+
+
+def set_timezone(name):
+    os.environ["TZ"] = name
+    time.tzset()
+
+
+def check():
+    lines = [json.dumps(entry) for entry in SAMPLE]
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "syslog.txt")
+        packed = os.path.join(folder, "syslog.bin")
+        target = os.path.join(folder, "back.txt")
+        with open(source, "w") as file:
+            file.write("\n".join(lines) + "\n")
+        set_timezone("America/New_York")
+        convert_log(source, packed, True)
+        set_timezone("UTC")
+        convert_log(packed, target, False)
+        with open(target) as file:
+            result = file.read().splitlines()
+    for expected, actual in zip(lines, result):
+        if expected != actual:
+            print(f"FAIL {expected} -> {actual}")
+    ok = result == lines
+    print(f"round trip America/New_York -> UTC: {'OK' if ok else 'FAILED'} ({len(result)} of {len(lines)} entries)")
+    return ok
+
+
+def main():
+    if "--check" in sys.argv:
+        sys.exit(0 if check() else 1)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if len(args) != 2:
+        print(__doc__)
+        sys.exit(1)
+    source, target = args
+    if "--to-binary" in sys.argv:
+        binary = True
+    elif "--to-json" in sys.argv:
+        binary = False
+    else:
+        with open(source, "rb") as file:
+            binary = file.read(1) in (b"{", b"")
+    count = convert_log(source, target, binary)
+    print(f"{count} entries, {os.path.getsize(source)} B -> {os.path.getsize(target)} B ({'binary' if binary else 'JSON'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Host-side `tail -f` for the board log. Polls GET /syslog with Range: bytes=<offset>- so only the bytes appended since
+the last poll cross the network and the board does no parsing. Starts over when X-Log-Sequence changes (the log was
+rotated) or the log shrinks (it was cleared).
+
+Usage: python3 tools/tail_syslog.py <ip> <port> <api_key> [interval]
+"""
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def fetch(url, api_key, offset):
+    request = urllib.request.Request(url, headers={"X-API-Key": api_key, "Range": f"bytes={offset}-"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+    url = f"http://{sys.argv[1]}:{sys.argv[2]}/syslog"
+    api_key = sys.argv[3]
+    interval = float(sys.argv[4]) if len(sys.argv) > 4 else 2.0
+    offset = 0
+    sequence = None
+    while True:
+        status, headers, body = fetch(url, api_key, offset)
+        if headers.get("X-Log-Sequence") != sequence and sequence is not None:
+            offset = 0
+            status, headers, body = fetch(url, api_key, offset)
+        sequence = headers.get("X-Log-Sequence")
+        if status == 416:
+            # Nothing new, or the log was cleared: Content-Range is bytes */<size>
+            size = int(headers.get("Content-Range", "bytes */0").rpartition("/")[2])
+            if size < offset:
+                offset = 0
+                continue
+        elif status in (200, 206):
+            sys.stdout.write(body.decode("utf-8", "replace"))
+            sys.stdout.flush()
+            offset += len(body)
+        else:
+            print(f"HTTP {status}", file=sys.stderr)
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    main()